@@ -11,6 +11,7 @@ This application integrates all processing modules and provides REST API endpoin
 API Endpoints:
 - POST /upload - Upload CSV and optional KMZ files
 - POST /generate - Start processing job
+- POST /generate/batch - Start processing several jobs
 - GET /status/<job_id> - Check processing status
 - GET /download/<job_id> - Download generated files
 - GET /health - Health check
@@ -20,27 +21,35 @@ Date: November 2, 2025
 Version: 1.0
 """
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, Request, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
 import os
 import uuid
 import json
+import tempfile
+import zipfile
 import logging
 from datetime import datetime
 import threading
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; Flask's stdlib JSON provider is used instead
+    orjson = None
+
 # Import processing modules
-from csv_parser import parse_csv, validate_csv_file, get_csv_preview, filter_by_states
+from csv_parser import parse_csv_files, validate_csv_file, get_csv_preview, filter_by_states
 from kmz_parser import parse_kmz, validate_kmz_file, get_kmz_stats
 from location_matcher import match_locations, generate_match_report
 from data_merger import (
     merge_datasets, 
     generate_merge_summary, 
-    prepare_kmz_metadata,
-    group_locations_by_state
+    prepare_kmz_metadata
 )
 from county_lookup import CountyLookup, add_county_to_locations
 from kmz_generator import generate_kmz, generate_state_kmz_files
@@ -52,8 +61,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+    
+    Every jsonify() call goes through this provider, so job status and merge
+    summaries are serialized straight to bytes by orjson instead of stdlib json.
+    """
+    
+    def _options(self, pretty=False):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+    
+    def dumps(self, obj, **kwargs):
+        options = self._options(pretty=bool(kwargs.get('indent')))
+        return orjson.dumps(obj, default=self.default, option=options).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        body = orjson.dumps(
+            obj,
+            default=self.default,
+            option=self._options(pretty) | orjson.OPT_APPEND_NEWLINE
+        )
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+class UploadRequest(Request):
+    """
+    Request that spools multipart file uploads straight into the upload folder.
+    
+    Werkzeug's default keeps small uploads in memory and spills larger ones to an
+    anonymous temp file, which FileStorage.save() then copies a second time. Spooling
+    into a named temp file beside the job folders lets save_upload() link the data
+    into place instead of copying it.
+    """
+    
+    def _get_file_stream(self, total_content_length, content_type, filename=None,
+                         content_length=None):
+        return tempfile.NamedTemporaryFile(mode='w+b', dir=UPLOAD_FOLDER, prefix='.upload-')
+
+
 # Initialize Flask app
 app = Flask(__name__)
+app.request_class = UploadRequest
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # Configuration
@@ -61,8 +123,17 @@ UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'outputs'
 MAX_CSV_SIZE_MB = 50
 MAX_KMZ_SIZE_MB = 10
-ALLOWED_CSV_EXTENSIONS = {'csv'}
-ALLOWED_KMZ_EXTENSIONS = {'kmz'}
+UPLOAD_COPY_BUFFER_SIZE = 1024 * 1024  # Used when an upload can't be hard-linked
+MAX_CONCURRENT_JOBS = 4
+# Parsed CSVs are cached inside the job's upload folder, so re-running a
+# failed job skips parsing files that haven't changed
+CSV_PARSE_CACHE_DIRNAME = '.parse_cache'
+# KMZ members are stored uncompressed unless a job asks for a deflate level
+# (1 = fastest, 9 = smallest) via compression_level
+KMZ_COMPRESSION = zipfile.ZIP_STORED
+KMZ_COMPRESSLEVEL = None
+ALLOWED_CSV_EXTENSIONS = frozenset({'csv'})
+ALLOWED_KMZ_EXTENSIONS = frozenset({'kmz'})
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
@@ -76,10 +147,112 @@ os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 jobs = {}
 jobs_lock = threading.Lock()
 
+# County lookups are shared by every job so the cache stays warm in memory
+# between jobs instead of being reloaded from disk each time
+county_lookup_service = CountyLookup(cache_file='county_cache.json')
+
+# Jobs run on a fixed pool of reusable worker threads instead of a new thread
+# per request; extra jobs wait in the pool's queue
+job_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_JOBS, thread_name_prefix='kmz-job')
+
+
+def _default_file_mode():
+    """Mode a newly created file gets under the process umask (e.g. 0644)."""
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+# Spooled uploads are created 0600 by NamedTemporaryFile and a hard link keeps
+# that mode, so saved uploads are reset to what a plain copy would have gotten.
+# Read once at import, since changing the umask to read it isn't thread-safe
+UPLOAD_FILE_MODE = _default_file_mode()
+
 
 def allowed_file(filename, extensions):
-    """Check if file has allowed extension."""
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in extensions
+    """Check if file has allowed extension (extensions: lowercase, no leading dot)."""
+    ext = os.path.splitext(filename)[1][1:].lower()
+    return bool(ext) and ext in extensions
+
+
+def save_upload(file_storage, filepath):
+    """
+    Persist an uploaded file, hard-linking the spooled upload when possible.
+    
+    Falls back to FileStorage.save() (a full copy) when the upload was not spooled
+    to a named file or the filesystem refuses the link. The spooled temp file itself
+    is removed when Flask closes the request.
+    """
+    spooled_path = getattr(file_storage.stream, 'name', None)
+    if isinstance(spooled_path, str):
+        try:
+            file_storage.stream.flush()
+            os.link(spooled_path, filepath)
+        except OSError:
+            pass
+        else:
+            try:
+                os.chmod(filepath, UPLOAD_FILE_MODE)
+                return
+            except OSError:
+                # The link shares the spooled file's data, so it has to go
+                # before save() writes a copy at this path
+                os.unlink(filepath)
+    
+    file_storage.save(filepath, buffer_size=UPLOAD_COPY_BUFFER_SIZE)
+
+
+def build_download_archive(job_id):
+    """
+    Bundle a job's generated KMZ files into the ZIP served by /download.
+    
+    Called from the background job once its outputs are written, so the
+    download request only has to stream an existing file.
+    
+    Args:
+        job_id (str): Job ID
+    
+    Returns:
+        str: Path to the ZIP archive
+    """
+    output_folder = os.path.join(OUTPUT_FOLDER, job_id)
+    zip_path = os.path.join(OUTPUT_FOLDER, f'{job_id}.zip')
+    temp_path = f'{zip_path}.{threading.get_ident()}.tmp'
+    
+    with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for filename in os.listdir(output_folder):
+            filepath = os.path.join(output_folder, filename)
+            # KMZ files written with compression_level are already deflated;
+            # compressing them again costs time and saves nothing
+            if _is_deflated_archive(filepath):
+                zipf.write(filepath, filename, compress_type=zipfile.ZIP_STORED)
+            else:
+                zipf.write(filepath, filename)
+    
+    # Swap into place so a download never sees a half-written archive
+    os.replace(temp_path, zip_path)
+    
+    return zip_path
+
+
+def _is_deflated_archive(path):
+    """
+    Check whether a file is a ZIP (e.g. KMZ) whose members are all compressed.
+    
+    Args:
+        path (str): File to check
+    
+    Returns:
+        bool: True if every member is compressed, False otherwise (including
+            for files that aren't ZIP archives)
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            members = archive.infolist()
+    except (zipfile.BadZipFile, OSError):
+        return False
+    
+    return bool(members) and all(info.compress_type != zipfile.ZIP_STORED for info in members)
 
 
 def create_job_id():
@@ -149,7 +322,7 @@ def upload_files():
             if csv_file and allowed_file(csv_file.filename, ALLOWED_CSV_EXTENSIONS):
                 filename = secure_filename(csv_file.filename)
                 filepath = os.path.join(job_folder, filename)
-                csv_file.save(filepath)
+                save_upload(csv_file, filepath)
                 
                 # Validate CSV
                 is_valid, error = validate_csv_file(filepath, MAX_CSV_SIZE_MB)
@@ -167,7 +340,7 @@ def upload_files():
             if allowed_file(kmz_file.filename, ALLOWED_KMZ_EXTENSIONS):
                 filename = secure_filename(kmz_file.filename)
                 kmz_file_path = os.path.join(job_folder, filename)
-                kmz_file.save(kmz_file_path)
+                save_upload(kmz_file, kmz_file_path)
                 
                 # Validate KMZ
                 is_valid, error = validate_kmz_file(kmz_file_path, MAX_KMZ_SIZE_MB)
@@ -234,67 +407,134 @@ def generate_kmz():
             },
             "merge_with_kmz": true,
             "match_threshold_meters": 200,
-            "include_unmatched_proposed": true
+            "include_unmatched_proposed": true,
+            "compression_level": 6
         }
     
+    compression_level is optional: 1-9 deflates the KMZ files at that level,
+    omitted or null uses KMZ_COMPRESSION/KMZ_COMPRESSLEVEL.
+    
     Returns:
         JSON with processing status
     """
     try:
         data = request.get_json()
-        job_id = data.get('job_id')
-        
-        if not job_id:
-            return jsonify({'error': 'job_id is required'}), 400
-        
-        job = get_job(job_id)
-        if not job:
-            return jsonify({'error': 'Job not found'}), 404
+        body, status_code = start_job(data)
+        return jsonify(body), status_code
         
-        if job['status'] not in ['uploaded', 'failed']:
-            return jsonify({'error': f'Job already {job["status"]}'}), 400
-        
-        # Get processing parameters
-        csv_state_selections = data.get('csv_state_selections', {})
-        merge_with_kmz = data.get('merge_with_kmz', True)
-        match_threshold = data.get('match_threshold_meters', 200)
-        include_unmatched_proposed = data.get('include_unmatched_proposed', True)
+    except Exception as e:
+        logger.error(f"Generate error: {str(e)}\n{traceback.format_exc()}")
+        return jsonify({'error': f'Failed to start processing: {str(e)}'}), 500
+
+
+@app.route('/generate/batch', methods=['POST'])
+def generate_kmz_batch():
+    """
+    Start processing several jobs in one request.
+    
+    Expected JSON body:
+        {
+            "jobs": [
+                {"job_id": "...", "csv_state_selections": {...}, ...},
+                {"job_id": "...", "merge_with_kmz": false}
+            ]
+        }
+    
+    Each entry takes the same fields as /generate. Jobs are validated and
+    queued independently, so one bad entry doesn't stop the rest.
+    
+    Returns:
+        JSON with a result per job, in request order
+    """
+    try:
+        data = request.get_json()
+        job_requests = data.get('jobs') if isinstance(data, dict) else None
         
-        # Update job status
-        update_job(job_id, {
-            'status': 'processing',
-            'progress': 0,
-            'updated_at': datetime.utcnow().isoformat(),
-            'parameters': {
-                'csv_state_selections': csv_state_selections,
-                'merge_with_kmz': merge_with_kmz,
-                'match_threshold': match_threshold,
-                'include_unmatched_proposed': include_unmatched_proposed
-            }
-        })
+        if not isinstance(job_requests, list) or not job_requests:
+            return jsonify({'error': 'jobs must be a non-empty list'}), 400
         
-        # Start processing in background thread
-        thread = threading.Thread(
-            target=process_job,
-            args=(job_id,)
-        )
-        thread.daemon = True
-        thread.start()
+        results = []
+        for job_data in job_requests:
+            if not isinstance(job_data, dict):
+                results.append({'error': 'Each job must be an object', 'status_code': 400})
+                continue
+            body, status_code = start_job(job_data)
+            results.append({'job_id': job_data.get('job_id'), **body, 'status_code': status_code})
         
-        logger.info(f"Started processing job {job_id}")
+        started = sum(1 for result in results if result['status_code'] == 200)
+        logger.info(f"Batch generate: started {started} of {len(results)} jobs")
         
         return jsonify({
-            'job_id': job_id,
-            'status': 'processing',
-            'estimated_time_seconds': 120,
-            'processing_started': datetime.utcnow().isoformat()
+            'jobs': results,
+            'started': started,
+            'failed': len(results) - started
         }), 200
         
     except Exception as e:
-        logger.error(f"Generate error: {str(e)}\n{traceback.format_exc()}")
+        logger.error(f"Batch generate error: {str(e)}\n{traceback.format_exc()}")
         return jsonify({'error': f'Failed to start processing: {str(e)}'}), 500
 
 
+def start_job(data):
+    """
+    Validate a generate request and queue its job for processing.
+    
+    Args:
+        data (dict): Request body for a single job (see /generate)
+    
+    Returns:
+        tuple: (response_body, status_code)
+    """
+    job_id = data.get('job_id')
+    
+    if not job_id:
+        return {'error': 'job_id is required'}, 400
+    
+    job = get_job(job_id)
+    if not job:
+        return {'error': 'Job not found'}, 404
+    
+    if job['status'] not in ['uploaded', 'failed']:
+        return {'error': f'Job already {job["status"]}'}, 400
+    
+    # Get processing parameters
+    csv_state_selections = data.get('csv_state_selections', {})
+    merge_with_kmz = data.get('merge_with_kmz', True)
+    match_threshold = data.get('match_threshold_meters', 200)
+    include_unmatched_proposed = data.get('include_unmatched_proposed', True)
+    compression_level = data.get('compression_level')
+    
+    if compression_level is not None and (
+            type(compression_level) is not int or not 1 <= compression_level <= 9):
+        return {'error': 'compression_level must be an integer from 1 to 9'}, 400
+    
+    # Update job status
+    update_job(job_id, {
+        'status': 'processing',
+        'progress': 0,
+        'updated_at': datetime.utcnow().isoformat(),
+        'parameters': {
+            'csv_state_selections': csv_state_selections,
+            'merge_with_kmz': merge_with_kmz,
+            'match_threshold': match_threshold,
+            'include_unmatched_proposed': include_unmatched_proposed,
+            'compression_level': compression_level
+        }
+    })
+    
+    # Start processing in the background job pool
+    job_executor.submit(process_job, job_id)
+    
+    logger.info(f"Started processing job {job_id}")
+    
+    return {
+        'job_id': job_id,
+        'status': 'processing',
+        'estimated_time_seconds': 120,
+        'processing_started': datetime.utcnow().isoformat()
+    }, 200
+
+
 def process_job(job_id):
     """
     Background processing function for generating KMZ files.
@@ -315,15 +555,17 @@ def process_job(job_id):
         csv_state_selections = params.get('csv_state_selections', {})
         merge_with_kmz = params.get('merge_with_kmz', True)
         match_threshold = params.get('match_threshold', 200)
+        compression_level = params.get('compression_level')
         
         # Step 1: Parse CSV files (10% progress)
         update_job(job_id, {'progress': 10, 'current_step': 'Parsing CSV files'})
         logger.info(f"[{job_id}] Parsing CSV files")
         
         csv_locations = []
-        for csv_path in job['csv_files']:
+        parse_cache_dir = os.path.join(UPLOAD_FOLDER, job_id, CSV_PARSE_CACHE_DIRNAME)
+        parsed_files = parse_csv_files(job['csv_files'], cache_dir=parse_cache_dir)
+        for csv_path, locations in zip(job['csv_files'], parsed_files):
             filename = os.path.basename(csv_path)
-            locations = parse_csv(csv_path)
             
             # Apply state filter if specified
             if filename in csv_state_selections:
@@ -368,9 +610,8 @@ def process_job(job_id):
         update_job(job_id, {'progress': 80, 'current_step': 'Looking up counties'})
         logger.info(f"[{job_id}] Adding county data")
         
-        county_lookup = CountyLookup(cache_file='county_cache.json')
         locations_with_data = [loc['data'] for loc in final_locations]
-        enriched_locations = add_county_to_locations(locations_with_data, county_lookup)
+        enriched_locations = add_county_to_locations(locations_with_data, county_lookup_service)
         
         # Step 6: Generate KMZ files (90% progress)
         update_job(job_id, {'progress': 90, 'current_step': 'Generating KMZ files'})
@@ -385,21 +626,31 @@ def process_job(job_id):
         logger.info(f"  Total stores US: {kmz_metadata['total_stores_us']}")
         logger.info(f"  States with data: {', '.join(kmz_metadata['state_store_counts'].keys())}")
         
-        # Group locations by state
-        states_dict = group_locations_by_state(final_locations)
-        logger.info(f"[{job_id}] Grouped into {len(states_dict)} states")
+        # The per-state store counts already cover every state, so there's
+        # no need to build a separate copy of the locations grouped by state
+        logger.info(f"[{job_id}] Grouped into {len(kmz_metadata['state_store_counts'])} states")
         
         # Generate state-level KMZ files using actual KMZ generator
         output_folder = os.path.join(OUTPUT_FOLDER, job_id)
         os.makedirs(output_folder, exist_ok=True)
         
+        if compression_level is None:
+            compression, compresslevel = KMZ_COMPRESSION, KMZ_COMPRESSLEVEL
+        else:
+            compression, compresslevel = zipfile.ZIP_DEFLATED, compression_level
+        
         generated_files = generate_state_kmz_files(
             enriched_locations,
             output_folder,
-            kmz_metadata
+            kmz_metadata,
+            compression=compression,
+            compresslevel=compresslevel
         )
         
         logger.info(f"[{job_id}] Generated {len(generated_files)} KMZ files")
+        
+        # Build the download archive here rather than on the download request
+        build_download_archive(job_id)
 
         
         # Step 7: Complete (100% progress)
@@ -490,14 +741,10 @@ def download_files(job_id):
         if not os.path.exists(output_folder):
             return jsonify({'error': 'Output files not found'}), 404
         
-        # Create ZIP file
-        import zipfile
+        # The job normally builds the archive when it finishes
         zip_path = os.path.join(OUTPUT_FOLDER, f'{job_id}.zip')
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for filename in os.listdir(output_folder):
-                filepath = os.path.join(output_folder, filename)
-                zipf.write(filepath, filename)
+        if not os.path.exists(zip_path):
+            zip_path = build_download_archive(job_id)
         
         logger.info(f"Serving download for job {job_id}")
         
@@ -572,6 +819,7 @@ if __name__ == '__main__':
     print("\nAPI Endpoints:")
     print("  POST   /upload         - Upload CSV and KMZ files")
     print("  POST   /generate       - Start processing job")
+    print("  POST   /generate/batch - Start several jobs at once")
     print("  GET    /status/<id>    - Check job status")
     print("  GET    /download/<id>  - Download generated files")
     print("  GET    /jobs           - List all jobs")
@@ -22,20 +22,32 @@ Version: 1.0
 import logging
 import time
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional, Dict, Tuple, List
 import os
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; the json module is used without it
+    orjson = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default cache key precision: coordinates rounded to 6 decimal places
+# (millionths of a degree, ~0.1m)
+CACHE_PRECISION = 6
+
 
 class CountyLookup:
     """
     County lookup service with caching and multiple data sources.
     """
     
-    def __init__(self, cache_file='county_cache.json', use_fcc=True, use_nominatim=True):
+    def __init__(self, cache_file='county_cache.json', use_fcc=True, use_nominatim=True,
+                 max_workers=8, cache_precision=CACHE_PRECISION):
         """
         Initialize county lookup service.
         
@@ -43,11 +55,28 @@ class CountyLookup:
             cache_file (str): Path to cache file for storing results
             use_fcc (bool): Enable FCC API (US only, recommended)
             use_nominatim (bool): Enable Nominatim API (backup, rate limited)
+            max_workers (int): Concurrent API lookups in lookup_batch
+            cache_precision (int): Decimal places coordinates are rounded to
+                for caching; coordinates that round to the same key share one
+                lookup (4 places is ~11m, which rarely crosses a county line)
         """
         self.cache_file = cache_file
+        self.cache_precision = cache_precision
+        self._cache_scale = 10 ** cache_precision
         self.cache = self._load_cache()
+        self._dirty = False  # True when the cache has entries not yet saved
+        self._generation = 0  # Bumped on every cache write
+        self._saved_generation = 0  # Generation of the cache file on disk
         self.use_fcc = use_fcc
         self.use_nominatim = use_nominatim
+        self.max_workers = max_workers
+        
+        # Shared HTTP session (created on first API call) so lookups reuse
+        # pooled keep-alive connections instead of reconnecting every time
+        self._session = None
+        
+        # Guards the rate limiter, stats and cache across batch worker threads
+        self._lock = threading.Lock()
         
         # Rate limiting
         self.last_fcc_call = 0
@@ -75,12 +104,12 @@ class CountyLookup:
         Returns:
             str: County name (e.g., "Fulton County") or None if not found
         """
-        self.stats['total_lookups'] += 1
+        self._count('total_lookups')
         
         # Check cache first
-        cache_key = f"{latitude:.6f},{longitude:.6f}"
+        cache_key = self._cache_key(latitude, longitude)
         if cache_key in self.cache:
-            self.stats['cache_hits'] += 1
+            self._count('cache_hits')
             logger.debug(f"Cache hit for {cache_key}")
             return self.cache[cache_key]
         
@@ -99,7 +128,7 @@ class CountyLookup:
                 return county
         
         # No result found
-        self.stats['failures'] += 1
+        self._count('failures')
         logger.warning(f"Could not find county for coordinates: {latitude}, {longitude}")
         self._cache_result(cache_key, None)
         return None
@@ -109,6 +138,10 @@ class CountyLookup:
         """
         Look up counties for multiple coordinates efficiently.
         
+        Cached coordinates are answered immediately; the rest are looked up
+        concurrently on up to max_workers threads. The per-service rate
+        limits still apply across all threads.
+        
         Args:
             coordinates (list): List of (latitude, longitude) tuples
             show_progress (bool): Print progress updates
@@ -121,21 +154,80 @@ class CountyLookup:
         
         logger.info(f"Starting batch lookup for {total} coordinates")
         
-        for idx, (lat, lon) in enumerate(coordinates, 1):
-            county = self.lookup_county(lat, lon)
-            results[(lat, lon)] = county
-            
-            if show_progress and idx % 10 == 0:
-                progress = (idx / total) * 100
-                logger.info(f"Progress: {idx}/{total} ({progress:.1f}%) - "
-                          f"Cache hits: {self.stats['cache_hits']}")
+        # Answer cache hits up front; only misses need the network, and
+        # coordinates sharing a cache key are looked up once
+        pending = {}
+        for lat, lon in coordinates:
+            if (lat, lon) in results:
+                continue
+            cache_key = self._cache_key(lat, lon)
+            if cache_key in self.cache:
+                results[(lat, lon)] = self.lookup_county(lat, lon)
+            else:
+                results[(lat, lon)] = None
+                pending.setdefault(cache_key, []).append((lat, lon))
+        
+        if pending:
+            workers = max(1, min(self.max_workers, len(pending)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self.lookup_county, *coords[0]): coords
+                    for coords in pending.values()
+                }
+                
+                for idx, future in enumerate(as_completed(futures), 1):
+                    county = future.result()
+                    for coord in futures[future]:
+                        results[coord] = county
+                    
+                    if show_progress and idx % 10 == 0:
+                        progress = (idx / len(pending)) * 100
+                        logger.info(f"Progress: {idx}/{len(pending)} API lookups ({progress:.1f}%) - "
+                                  f"Cache hits: {self.stats['cache_hits']}")
         
         logger.info(f"Batch lookup complete. Cache hit rate: "
                    f"{self.stats['cache_hits']}/{total} "
-                   f"({self.stats['cache_hits']/total*100:.1f}%)")
+                   f"({self.stats['cache_hits']/total*100 if total else 0.0:.1f}%)")
         
         return results
     
+    def _count(self, stat: str):
+        """
+        Increment a statistics counter safely from any thread.
+        
+        Args:
+            stat (str): Key in self.stats
+        """
+        with self._lock:
+            self.stats[stat] += 1
+    
+    def _get_session(self):
+        """
+        Get the shared requests session, creating it on first use.
+        
+        The connection pool is sized to max_workers so concurrent batch
+        lookups don't have to open new connections.
+        
+        Returns:
+            requests.Session: Session with pooled HTTP adapters
+        
+        Raises:
+            ImportError: If the requests library is not installed
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, self.max_workers))
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._session = session
+        
+        return self._session
+    
     def _lookup_fcc(self, latitude: float, longitude: float) -> Optional[str]:
         """
         Look up county using FCC API (US only).
@@ -151,7 +243,7 @@ class CountyLookup:
             str: County name or None
         """
         try:
-            import requests
+            session = self._get_session()
             
             # Rate limiting
             self._wait_for_rate_limit('fcc')
@@ -163,10 +255,10 @@ class CountyLookup:
                 'format': 'json'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = session.get(url, params=params, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json_response(response)
                 
                 # Extract county name from results
                 if 'results' in data and len(data['results']) > 0:
@@ -174,7 +266,7 @@ class CountyLookup:
                     county_name = result.get('county_name')
                     
                     if county_name:
-                        self.stats['fcc_calls'] += 1
+                        self._count('fcc_calls')
                         logger.debug(f"FCC lookup successful: {county_name}")
                         return county_name
             
@@ -204,7 +296,7 @@ class CountyLookup:
             str: County name or None
         """
         try:
-            import requests
+            session = self._get_session()
             
             # Rate limiting (Nominatim policy: max 1 request per second)
             self._wait_for_rate_limit('nominatim')
@@ -220,10 +312,10 @@ class CountyLookup:
                 'User-Agent': 'CountyLookupService/1.0'  # Required by Nominatim
             }
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            response = session.get(url, params=params, headers=headers, timeout=10)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _parse_json_response(response)
                 
                 # Extract county from address
                 if 'address' in data:
@@ -234,7 +326,7 @@ class CountyLookup:
                              address.get('state_district'))
                     
                     if county:
-                        self.stats['nominatim_calls'] += 1
+                        self._count('nominatim_calls')
                         logger.debug(f"Nominatim lookup successful: {county}")
                         
                         # Add "County" suffix if not present
@@ -258,34 +350,69 @@ class CountyLookup:
         """
         Implement rate limiting for API calls.
         
+        Each caller reserves the next free call slot under the lock and then
+        sleeps outside it, so concurrent lookups are spaced out evenly
+        instead of all firing at once.
+        
         Args:
             service (str): 'fcc' or 'nominatim'
         """
-        current_time = time.time()
+        with self._lock:
+            current_time = time.time()
+            
+            if service == 'fcc':
+                slot = max(current_time, self.last_fcc_call + self.fcc_min_interval)
+                self.last_fcc_call = slot
+            elif service == 'nominatim':
+                slot = max(current_time, self.last_nominatim_call + self.nominatim_min_interval)
+                self.last_nominatim_call = slot
+            else:
+                return
         
-        if service == 'fcc':
-            time_since_last = current_time - self.last_fcc_call
-            if time_since_last < self.fcc_min_interval:
-                time.sleep(self.fcc_min_interval - time_since_last)
-            self.last_fcc_call = time.time()
+        if slot > current_time:
+            time.sleep(slot - current_time)
+    
+    def _cache_key(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        """
+        Build the in-memory cache key for a coordinate pair.
         
-        elif service == 'nominatim':
-            time_since_last = current_time - self.last_nominatim_call
-            if time_since_last < self.nominatim_min_interval:
-                time.sleep(self.nominatim_min_interval - time_since_last)
-            self.last_nominatim_call = time.time()
+        A tuple of two small ints hashes much faster than a formatted string
+        and needs no string formatting per lookup.
+        
+        Args:
+            latitude (float): Latitude in degrees
+            longitude (float): Longitude in degrees
+        
+        Returns:
+            tuple: (latitude, longitude) in units of 10**-cache_precision degrees
+        """
+        return (round(latitude * self._cache_scale), round(longitude * self._cache_scale))
     
     def _load_cache(self) -> Dict:
         """
         Load cache from file.
         
+        The file stores "lat,lon" string keys (JSON objects can't have tuple
+        keys); they are converted to the integer tuple keys used in memory.
+        
         Returns:
             dict: Cached lookup results
         """
         if os.path.exists(self.cache_file):
             try:
-                with open(self.cache_file, 'r') as f:
-                    cache = json.load(f)
+                if orjson is not None:
+                    with open(self.cache_file, 'rb') as f:
+                        stored = orjson.loads(f.read())
+                else:
+                    with open(self.cache_file, 'r') as f:
+                        stored = json.load(f)
+                cache = {}
+                for key, county in stored.items():
+                    try:
+                        lat, lon = key.split(',')
+                        cache[self._cache_key(float(lat), float(lon))] = county
+                    except ValueError:
+                        logger.debug(f"Ignoring malformed cache key: {key}")
                 logger.info(f"Loaded {len(cache)} cached county lookups")
                 return cache
             except Exception as e:
@@ -293,26 +420,64 @@ class CountyLookup:
         
         return {}
     
-    def _cache_result(self, key: str, value: Optional[str]):
+    def _cache_result(self, key: Tuple[int, int], value: Optional[str]):
         """
         Cache a lookup result.
         
         Args:
-            key (str): Cache key (formatted coordinates)
+            key (tuple): Cache key from _cache_key()
             value (str or None): County name or None
         """
-        self.cache[key] = value
+        with self._lock:
+            self.cache[key] = value
+            self._dirty = True
+            self._generation += 1
     
     def save_cache(self):
         """
         Save cache to file.
+        
+        Skipped when nothing was added since the last save. The file is
+        written to a temporary path and swapped into place, so a reader (or
+        a crash mid-write) never sees a half-written cache. The swap happens
+        under the lock and only if no newer snapshot has been saved, so
+        concurrent saves can't leave an older cache on disk; the cache stays
+        dirty if lookups were added after the snapshot was taken.
         """
+        with self._lock:
+            if not self._dirty:
+                logger.debug("County cache unchanged, not saving")
+                return
+            scale, precision = self._cache_scale, self.cache_precision
+            snapshot = {
+                f"{lat / scale:.{precision}f},{lon / scale:.{precision}f}": county
+                for (lat, lon), county in self.cache.items()
+            }
+            generation = self._generation
+        
+        temp_path = f"{self.cache_file}.{os.getpid()}.{threading.get_ident()}.tmp"
         try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f, indent=2)
-            logger.info(f"Saved {len(self.cache)} county lookups to cache")
+            if orjson is not None:
+                with open(temp_path, 'wb') as f:
+                    f.write(orjson.dumps(snapshot))
+            else:
+                with open(temp_path, 'w') as f:
+                    json.dump(snapshot, f, separators=(',', ':'))
+            with self._lock:
+                if generation <= self._saved_generation:
+                    # A concurrent save already wrote this snapshot or a newer one
+                    os.unlink(temp_path)
+                    return
+                os.replace(temp_path, self.cache_file)
+                self._saved_generation = generation
+                self._dirty = self._generation != generation
+            logger.info(f"Saved {len(snapshot)} county lookups to cache")
         except Exception as e:
             logger.error(f"Error saving cache: {str(e)}")
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
     
     def get_stats(self) -> Dict:
         """
@@ -333,15 +498,39 @@ class CountyLookup:
         """
         Clear the cache.
         """
-        self.cache = {}
-        if os.path.exists(self.cache_file):
-            os.remove(self.cache_file)
+        with self._lock:
+            self.cache = {}
+            self._dirty = False
+            # Any save still in flight holds an older snapshot; don't let it land
+            self._generation += 1
+            self._saved_generation = self._generation
+            if os.path.exists(self.cache_file):
+                os.remove(self.cache_file)
         logger.info("Cache cleared")
 
 
+def _parse_json_response(response):
+    """
+    Decode a JSON API response body.
+    
+    orjson parses the raw bytes directly, skipping the text decode and the
+    slower stdlib parser that response.json() goes through.
+    
+    Args:
+        response (requests.Response): HTTP response with a JSON body
+    
+    Returns:
+        dict: Decoded JSON
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
 def add_county_to_locations(locations: List[Dict], 
                            county_lookup: CountyLookup = None,
-                           save_cache: bool = True) -> List[Dict]:
+                           save_cache: bool = True,
+                           max_workers: int = 8) -> List[Dict]:
     """
     Add county names to a list of locations.
     
@@ -349,12 +538,14 @@ def add_county_to_locations(locations: List[Dict],
         locations (list): List of location dicts with Latitude and Longitude
         county_lookup (CountyLookup): County lookup service (creates new if None)
         save_cache (bool): Save cache after processing
+        max_workers (int): Concurrent API lookups for the service created
+            when county_lookup is None
     
     Returns:
         list: Locations with 'County' field added
     """
     if county_lookup is None:
-        county_lookup = CountyLookup()
+        county_lookup = CountyLookup(max_workers=max_workers)
     
     logger.info(f"Adding county data to {len(locations)} locations")
     
@@ -370,8 +561,8 @@ def add_county_to_locations(locations: List[Dict],
                 coord_to_locations[coord] = []
             coord_to_locations[coord].append(loc)
     
-    # Batch lookup
-    unique_coords = list(coord_to_locations.keys())
+    # Batch lookup (the keys view is iterated directly rather than copied)
+    unique_coords = coord_to_locations.keys()
     logger.info(f"Looking up {len(unique_coords)} unique coordinates")
     
     county_results = county_lookup.lookup_batch(unique_coords)
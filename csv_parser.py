@@ -22,16 +22,71 @@ Date: November 2, 2025
 Version: 1.0
 """
 
+import codecs
 import csv
+import hashlib
 import logging
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Dict, Set, Optional, Tuple
-import chardet
+
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:  # charset-normalizer is optional; chardet is tried next
+    detect_charset = None
+
+try:
+    import chardet
+except ImportError:
+    chardet = None
+
+try:
+    import pandas as pd
+except ImportError:  # pandas is optional; parsing falls back to csv.DictReader
+    pd = None
+
+try:
+    import pyarrow
+    from pyarrow import csv as pa_csv
+except ImportError:  # pyarrow is optional; pandas' C reader is used without it
+    pyarrow = None
+    pa_csv = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Bytes read by detect_encoding; enough for a confident guess without
+# reading the whole file
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Upper bound on files parsed at once by parse_csv_files and
+# parse_multiple_csv_files
+CSV_PARSE_MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+# Part of every parse cache key; bump it whenever parse_csv's output changes
+# so results cached by an older version are ignored
+PARSE_CACHE_VERSION = 3
+
+# Write buffer for export_to_csv, so large exports reach the disk in big
+# blocks rather than the default 8 KiB ones
+CSV_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Byte order marks checked before any statistical detection (UTF-32 first,
+# since its little-endian BOM starts with the UTF-16 one)
+BOM_ENCODINGS = [
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+
 # Required columns in Placer.ai CSV
 REQUIRED_COLUMNS = [
     'Rank',
@@ -60,6 +115,9 @@ OPTIONAL_COLUMNS = [
     'Country Code'
 ]
 
+# Columns converted to float when cleaning rows
+NUMERIC_COLUMNS = ['Latitude', 'Longitude', 'Visits', 'sq ft', 'Visits / sq ft']
+
 
 def parse_csv(csv_file_path, encoding='utf-8-sig'):
     """
@@ -83,42 +141,19 @@ def parse_csv(csv_file_path, encoding='utf-8-sig'):
         encoding = detect_encoding(csv_file_path)
         logger.info(f"Detected encoding: {encoding}")
     
-    locations = []
-    
     try:
-        with open(csv_file_path, 'r', encoding=encoding, errors='replace') as csvfile:
-            # Use csv.DictReader to automatically parse headers
-            reader = csv.DictReader(csvfile)
-            
-            # Validate headers
-            if not reader.fieldnames:
-                raise ValueError("CSV file appears to be empty or has no headers")
-            
-            validate_csv_headers(reader.fieldnames)
-            
-            # Read all rows
-            row_count = 0
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-                try:
-                    # Clean and validate row
-                    cleaned_row = clean_csv_row(row)
-                    
-                    # Skip empty rows
-                    if not cleaned_row.get('Property Name'):
-                        logger.debug(f"Skipping empty row {row_num}")
-                        continue
-                    
-                    # Add row number for debugging
-                    cleaned_row['_row_number'] = row_num
-                    
-                    locations.append(cleaned_row)
-                    row_count += 1
-                    
-                except Exception as e:
-                    logger.warning(f"Error parsing row {row_num}: {str(e)}")
-                    continue
+        if pd is not None:
+            try:
+                locations = parse_csv_vectorized(csv_file_path, encoding)
+            except Exception as e:
+                # Anything pandas can't handle (e.g. ragged rows that
+                # csv.reader tolerates) is parsed row by row instead
+                logger.warning(f"Vectorized parse failed ({str(e)}), falling back to csv module")
+                locations = parse_csv_rows(csv_file_path, encoding)
+        else:
+            locations = parse_csv_rows(csv_file_path, encoding)
         
-        logger.info(f"Successfully parsed {row_count} locations from CSV")
+        logger.info(f"Successfully parsed {len(locations)} locations from CSV")
         
     except UnicodeDecodeError as e:
         logger.error(f"Encoding error: {str(e)}. Try 'auto' encoding detection.")
@@ -132,6 +167,337 @@ def parse_csv(csv_file_path, encoding='utf-8-sig'):
     return locations
 
 
+def parse_csv_cached(csv_file_path, cache_dir, encoding='utf-8-sig'):
+    """
+    parse_csv with the parsed locations cached as JSON in a cache directory.
+    
+    Cache entries are keyed on the file's absolute path, modification time
+    and size (plus the encoding), so a file that is edited or replaced is
+    parsed again. A missing or unreadable cache entry is never an error.
+    The cache may live beside user uploads, so it is plain data (JSON),
+    never a format that can run code when loaded. Files with rows longer
+    than the header are not cached: their extra fields are kept under a
+    None key, which JSON cannot store.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        cache_dir (str): Directory for cache files (created if needed)
+        encoding (str): File encoding, as for parse_csv
+    
+    Returns:
+        list: List of location dicts, as from parse_csv
+    """
+    stat = os.stat(csv_file_path)
+    key = repr((PARSE_CACHE_VERSION, os.path.abspath(csv_file_path),
+                stat.st_mtime_ns, stat.st_size, encoding))
+    cache_path = os.path.join(cache_dir, hashlib.sha1(key.encode()).hexdigest() + '.json')
+    
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            locations = json.load(f)
+        if not isinstance(locations, list) or not all(isinstance(loc, dict) for loc in locations):
+            raise ValueError("not a list of locations")
+        logger.info(f"Loaded {len(locations)} parsed locations for {csv_file_path} from cache")
+        return locations
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable CSV parse cache {cache_path}: {str(e)}")
+    
+    locations = parse_csv(csv_file_path, encoding)
+    
+    # Extra fields on ragged rows sit under a None key, which JSON would
+    # turn into "null"; such files are simply parsed again next time
+    if any(None in loc for loc in locations):
+        logger.info(f"Not caching parsed locations for {csv_file_path}: rows have extra fields")
+        return locations
+    
+    # Written to a temporary name first so a concurrent reader never loads
+    # a partial file
+    temp_path = f'{cache_path}.{threading.get_ident()}.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(locations, f, separators=(',', ':'))
+        os.replace(temp_path, cache_path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"Could not write CSV parse cache {cache_path}: {str(e)}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+    
+    return locations
+
+
+def parse_csv_rows(csv_file_path, encoding='utf-8-sig'):
+    """
+    Parse a CSV file one row at a time with csv.DictReader.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+    
+    Returns:
+        list: List of cleaned location dicts
+    """
+    return list(iter_csv_rows(csv_file_path, encoding))
+
+
+def iter_csv_rows(csv_file_path, encoding='utf-8-sig'):
+    """
+    Stream cleaned location rows from a CSV file.
+    
+    Only one row is held in memory at a time, so callers that stop early
+    (e.g. validation that only needs the first location) never read the
+    rest of the file.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+    
+    Yields:
+        dict: Cleaned location dict with '_row_number' set
+    
+    Raises:
+        ValueError: If the CSV has no headers or is missing required columns
+    """
+    with open(csv_file_path, 'r', encoding=encoding, errors='replace') as csvfile:
+        # Plain csv.reader rows are lists; column positions are resolved once
+        # from the header instead of hashing every key of a DictReader row
+        reader = csv.reader(csvfile)
+        fieldnames = next(reader, None)
+        
+        # Validate headers
+        if not fieldnames:
+            raise ValueError("CSV file appears to be empty or has no headers")
+        
+        validate_csv_headers(fieldnames)
+        
+        columns = [(name, COLUMN_CONVERTERS.get(name)) for name in fieldnames]
+        width = len(fieldnames)
+        
+        # Blank lines are skipped without counting, as csv.DictReader does
+        rows = (values for values in reader if values)
+        
+        for row_num, values in enumerate(rows, start=2):  # Start at 2 (1 is header)
+            try:
+                if len(values) == width:
+                    # Clean and validate row
+                    cleaned_row = {}
+                    for (name, convert), value in zip(columns, values):
+                        value = value.strip()
+                        if not value:
+                            cleaned_row[name] = None
+                        elif convert is None:
+                            cleaned_row[name] = value
+                        else:
+                            cleaned_row[name] = convert(value)
+                else:
+                    # Ragged row: lay it out like csv.DictReader would
+                    row = dict(zip(fieldnames, values))
+                    if len(values) > width:
+                        row[None] = values[width:]
+                    else:
+                        for name in fieldnames[len(values):]:
+                            row[name] = None
+                    cleaned_row = clean_csv_row(row)
+                
+                # Skip empty rows
+                if not cleaned_row.get('Property Name'):
+                    logger.debug(f"Skipping empty row {row_num}")
+                    continue
+                
+                # Add row number for debugging
+                cleaned_row['_row_number'] = row_num
+                
+            except Exception as e:
+                logger.warning(f"Error parsing row {row_num}: {str(e)}")
+                continue
+            
+            yield cleaned_row
+
+
+def parse_csv_vectorized(csv_file_path, encoding='utf-8-sig'):
+    """
+    Parse a CSV file with pandas, cleaning whole columns at once.
+    
+    Produces the same location dicts as parse_csv_rows, but the stripping,
+    empty-value handling and numeric conversion run as column operations
+    instead of per-row Python calls. The differences are that literal 'nan'
+    text in a numeric column is treated as missing, and fields past the end
+    of the header (e.g. from a trailing comma) are dropped rather than kept
+    in a list under a None key.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+    
+    Returns:
+        list: List of cleaned location dicts
+    """
+    return parse_csv_columns(csv_file_path, encoding).to_dict('records')
+
+
+def parse_csv_columns(csv_file_path, encoding='utf-8-sig'):
+    """
+    Parse and clean a CSV file into a column-oriented pandas DataFrame.
+    
+    Each column holds the same cleaned values parse_csv puts in the location
+    dicts (None for missing), plus '_row_number'. Callers that only need
+    aggregates (counts, state lists) can work on the columns directly instead
+    of building a dict per location. The file is read with pyarrow's CSV
+    reader when pyarrow is installed, and with pandas' C reader otherwise
+    or when pyarrow rejects the file.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+    
+    Returns:
+        pandas.DataFrame: One row per location with a Property Name
+    """
+    # Header names are read with the csv module, exactly as iter_csv_rows
+    # sees them; pandas would rename a repeated name ('City' -> 'City.1')
+    with open(csv_file_path, 'r', encoding=encoding, errors='replace') as csvfile:
+        fieldnames = next(csv.reader(csvfile), None)
+    
+    if not fieldnames:
+        raise ValueError("CSV file appears to be empty or has no headers")
+    
+    validate_csv_headers(fieldnames)
+    
+    df = None
+    if pa_csv is not None:
+        try:
+            df = _read_csv_arrow(csv_file_path, encoding, len(fieldnames))
+            # Empty lines are skipped without being counted, as csv.reader does
+            row_numbers = (df.index + 2).to_numpy()
+        except (pyarrow.ArrowInvalid, UnicodeDecodeError) as e:
+            # Rows wider or narrower than the header, or text that doesn't
+            # decode; the C reader tolerates some of these
+            logger.debug(f"pyarrow CSV read failed ({str(e)}), using the C reader")
+    
+    if df is None:
+        df, row_numbers = _read_csv_c(csv_file_path, encoding, len(fieldnames))
+    
+    # A repeated header name keeps its first position and its last value,
+    # as when iter_csv_rows fills a dict
+    columns = {}
+    for position, key in enumerate(fieldnames):
+        values = df[position]
+        if values.str.contains('\r', regex=False).any():
+            # Quoted line breaks read as '\n', as in the text-mode file iter_csv_rows reads
+            values = values.str.replace('\r\n', '\n', regex=False).str.replace('\r', '\n', regex=False)
+        values = values.str.strip()
+        present = values != ''
+        
+        if key == 'Rank':
+            # Only plain integers convert, matching int() on the raw string
+            present &= values.str.fullmatch(r'[+-]?\d+')
+            values = pd.Series([int(v) if ok else None for v, ok in zip(values, present)],
+                               index=values.index, dtype=object)
+        elif key in NUMERIC_COLUMNS:
+            # to_numeric finds the unparseable values; astype does the exact
+            # (round-trip) conversion that float() would
+            present &= pd.to_numeric(values.where(present), errors='coerce').notna()
+            values = values.where(present, None).astype(object)
+            values[present] = values[present].astype('float64')
+        elif key == 'State Code':
+            values = values.str.upper()
+        
+        columns[key] = values.astype(object).where(present, None)
+    
+    columns['_row_number'] = row_numbers
+    cleaned = pd.DataFrame(columns, index=df.index)
+    
+    # Skip rows without a property name
+    return cleaned[cleaned['Property Name'].notna()]
+
+
+def _read_csv_arrow(csv_file_path, encoding, width):
+    """
+    Read the data rows of a CSV as text with pyarrow's multi-threaded reader.
+    
+    Every column is declared a string, so nothing is type-inferred ('02134'
+    and '+7' stay as written, empty fields stay ''). pandas' own
+    engine='pyarrow' can't be used for this: it infers types before applying
+    dtype=str, turning ZIP '02134' into '2134'. Rows of a different width
+    than the header raise pyarrow.ArrowInvalid.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+        width (int): Number of header fields
+    
+    Returns:
+        pandas.DataFrame: The data rows, one column per header position
+    """
+    names = [str(position) for position in range(width)]
+    
+    # UTF-8 is decoded natively; the BOM, if any, is on the skipped header line
+    if codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig'):
+        encoding = 'utf8'
+    
+    table = pa_csv.read_csv(
+        csv_file_path,
+        read_options=pa_csv.ReadOptions(column_names=names, skip_rows=1, encoding=encoding),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pyarrow.string() for name in names},
+            strings_can_be_null=False, quoted_strings_can_be_null=False))
+    
+    df = table.to_pandas()
+    df.columns = range(width)
+    return df
+
+
+def _read_csv_c(csv_file_path, encoding, width):
+    """
+    Read the data rows of a CSV as text with pandas' C reader.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        encoding (str): File encoding
+        width (int): Number of header fields
+    
+    Returns:
+        tuple: (pandas.DataFrame with one column per header position,
+            row numbers as iter_csv_rows counts them)
+    """
+    # The C engine reads every field as the literal text. index_col=False
+    # stops rows with a trailing delimiter from turning the first column
+    # into the index; fields past the header are dropped. Blank lines are
+    # kept so rows can be numbered as csv.reader counts them
+    try:
+        df = pd.read_csv(csv_file_path, dtype=str, keep_default_na=False,
+                         encoding=encoding, encoding_errors='replace',
+                         engine='c', index_col=False, skip_blank_lines=False)
+    except pd.errors.EmptyDataError:
+        raise ValueError("CSV file appears to be empty or has no headers")
+    
+    if len(df.columns) != width:
+        raise pd.errors.ParserError("CSV header does not line up with the parsed columns")
+    df.columns = range(width)
+    
+    # Row numbers as iter_csv_rows counts them (1 is the header). An
+    # all-empty row is either a blank line, which csv.reader skips without
+    # counting, or a row of empty fields (',,,'), which it counts; only the
+    # raw records tell them apart, so they are only read when needed
+    if (df == '').all(axis=1).any():
+        with open(csv_file_path, 'r', encoding=encoding, errors='replace') as csvfile:
+            reader = csv.reader(csvfile)
+            next(reader, None)
+            counted = pd.Series([bool(values) for values in reader], dtype='int64')
+        if len(counted) != len(df):
+            raise pd.errors.ParserError("CSV records do not line up with the parsed rows")
+        row_numbers = (counted.cumsum() + 1).to_numpy()
+    else:
+        row_numbers = (df.index + 2).to_numpy()
+    
+    return df, row_numbers
+
+
 def validate_csv_headers(headers):
     """
     Validate that CSV has all required columns.
@@ -163,51 +529,70 @@ def clean_csv_row(row):
     - Handle empty/null values
     - Normalize state codes to uppercase
     
+    The row is cleaned in place rather than copied; csv.DictReader hands out
+    a fresh dict per row, so there is no need for a second dict per location.
+    
     Args:
         row (dict): Raw CSV row
     
     Returns:
-        dict: Cleaned row
+        dict: The same row, cleaned
     """
-    cleaned = {}
-    
+    # Only existing keys are reassigned, so updating while iterating is safe
     for key, value in row.items():
-        # Strip whitespace
+        # Strip whitespace once and handle empty values
         if isinstance(value, str):
             value = value.strip()
-        
-        # Handle empty values
-        if value == '' or value is None:
-            cleaned[key] = None
+            if not value:
+                row[key] = None
+                continue
+        elif value is None:
             continue
         
         # Convert specific fields to appropriate types
-        if key == 'Rank':
-            try:
-                cleaned[key] = int(value)
-            except (ValueError, TypeError):
-                cleaned[key] = None
-        
-        elif key in ['Latitude', 'Longitude', 'Visits', 'sq ft', 'Visits / sq ft']:
-            try:
-                cleaned[key] = float(value)
-            except (ValueError, TypeError):
-                cleaned[key] = None
-        
-        elif key == 'State Code':
-            # Normalize to uppercase
-            cleaned[key] = value.upper()
-        
-        else:
-            cleaned[key] = value
+        convert = COLUMN_CONVERTERS.get(key)
+        row[key] = convert(value) if convert is not None else value
     
-    return cleaned
+    return row
+
+
+def _to_int(value):
+    """Convert a stripped, non-empty CSV value to int, or None if it isn't one."""
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(value):
+    """Convert a stripped, non-empty CSV value to float, or None if it isn't one."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_upper(value):
+    """Normalize a code column (e.g. State Code) to uppercase."""
+    return value.upper()
+
+
+# Per-column converters applied by clean_csv_row; other columns stay strings
+COLUMN_CONVERTERS = {
+    'Rank': _to_int,
+    'State Code': _to_upper,
+    **{column: _to_float for column in NUMERIC_COLUMNS}
+}
 
 
 def detect_encoding(file_path):
     """
     Detect the encoding of a CSV file.
     
+    Only the first ENCODING_SAMPLE_SIZE bytes are read. A byte order mark or
+    valid UTF-8 settles it directly; anything else is handed to
+    charset-normalizer (or chardet) when installed.
+    
     Args:
         file_path (str): Path to the CSV file
     
@@ -215,15 +600,32 @@ def detect_encoding(file_path):
         str: Detected encoding (e.g., 'utf-8', 'utf-8-sig', 'iso-8859-1')
     """
     with open(file_path, 'rb') as f:
-        raw_data = f.read(10000)  # Read first 10KB for detection
-        result = chardet.detect(raw_data)
-        encoding = result['encoding']
-        
-        # Handle UTF-8 with BOM (common in Excel exports)
-        if encoding and encoding.lower().startswith('utf-8'):
-            encoding = 'utf-8-sig'
-        
-        return encoding or 'utf-8'
+        sample = f.read(ENCODING_SAMPLE_SIZE)
+    
+    for bom, encoding in BOM_ENCODINGS:
+        if sample.startswith(bom):
+            return encoding
+    
+    # Most exports are plain UTF-8; the incremental decoder tolerates a
+    # multi-byte character cut off at the end of the sample
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        pass
+    
+    encoding = None
+    if detect_charset is not None:
+        best = detect_charset(sample).best()
+        encoding = best.encoding if best is not None else None
+    elif chardet is not None:
+        encoding = chardet.detect(sample)['encoding']
+    
+    # Handle UTF-8 with BOM (common in Excel exports)
+    if encoding and encoding.lower().replace('_', '-').startswith('utf-8'):
+        encoding = 'utf-8-sig'
+    
+    return encoding or 'utf-8'
 
 
 def filter_by_states(locations, selected_states):
@@ -268,6 +670,45 @@ def get_available_states(locations):
     return sorted(list(states))
 
 
+def parse_csv_files(csv_file_paths, max_workers=CSV_PARSE_MAX_WORKERS, cache_dir=None):
+    """
+    Parse several CSV files concurrently with parse_csv.
+    
+    Args:
+        csv_file_paths (list): List of paths to CSV files
+        max_workers (int): Maximum number of files parsed at once
+        cache_dir (str): Optional directory for parse_csv_cached; None parses
+            every file from scratch
+    
+    Returns:
+        list: One list of location dicts per path, in the same order
+    
+    Raises:
+        Same as parse_csv, for the first failing file in input order
+    """
+    parse = partial(parse_csv_cached, cache_dir=cache_dir) if cache_dir else parse_csv
+    
+    if len(csv_file_paths) <= 1:
+        return [parse(csv_path) for csv_path in csv_file_paths]
+    
+    with ThreadPoolExecutor(max_workers=_csv_parse_workers(csv_file_paths, max_workers)) as executor:
+        return list(executor.map(parse, csv_file_paths))
+
+
+def _csv_parse_workers(csv_file_paths, max_workers=CSV_PARSE_MAX_WORKERS):
+    """
+    Get the thread count for parsing a list of CSV files.
+    
+    Args:
+        csv_file_paths (list): Paths about to be parsed
+        max_workers (int): Upper bound on threads
+    
+    Returns:
+        int: At least 1, at most one thread per file
+    """
+    return max(1, min(len(csv_file_paths), max_workers))
+
+
 def parse_multiple_csv_files(csv_file_paths, state_selections=None):
     """
     Parse multiple CSV files and optionally filter by state selections.
@@ -295,14 +736,18 @@ def parse_multiple_csv_files(csv_file_paths, state_selections=None):
         'errors': []
     }
     
-    for csv_path in csv_file_paths:
+    # Parse every file up front in parallel; results are still handled in
+    # input order below
+    with ThreadPoolExecutor(max_workers=_csv_parse_workers(csv_file_paths)) as executor:
+        futures = [executor.submit(parse_csv, csv_path) for csv_path in csv_file_paths]
+    
+    for csv_path, future in zip(csv_file_paths, futures):
         try:
             # Get filename for state selection lookup
-            import os
             filename = os.path.basename(csv_path)
             
             # Parse CSV
-            locations = parse_csv(csv_path)
+            locations = future.result()
             
             # Apply state filter if specified for this file
             if state_selections and filename in state_selections:
@@ -373,15 +818,14 @@ def validate_csv_file(csv_file_path, max_size_mb=50):
     if file_size_mb > max_size_mb:
         return False, f"File size ({file_size_mb:.1f}MB) exceeds maximum ({max_size_mb}MB)"
     
-    # Try to parse first few rows
+    # Only the first location is checked, so stop reading after it
     try:
-        locations = parse_csv(csv_file_path)
+        first_loc = next(iter_csv_rows(csv_file_path), None)
         
-        if len(locations) == 0:
+        if first_loc is None:
             return False, "CSV file contains no valid location data"
         
         # Check for required data in first location
-        first_loc = locations[0]
         if not first_loc.get('Latitude') or not first_loc.get('Longitude'):
             return False, "CSV locations are missing coordinate data"
         
@@ -409,6 +853,12 @@ def get_csv_preview(csv_file_path, num_rows=5):
             - columns (list): List of column names
     """
     try:
+        if pd is not None:
+            try:
+                return _get_csv_preview_columns(csv_file_path, num_rows)
+            except Exception:
+                pass  # Let parse_csv handle files pandas can't read
+        
         locations = parse_csv(csv_file_path)
         
         return {
@@ -430,6 +880,29 @@ def get_csv_preview(csv_file_path, num_rows=5):
         }
 
 
+def _get_csv_preview_columns(csv_file_path, num_rows):
+    """
+    Build the get_csv_preview() result from the columnar DataFrame.
+    
+    Args:
+        csv_file_path (str): Path to the CSV file
+        num_rows (int): Number of rows to preview
+    
+    Returns:
+        dict: Same structure as get_csv_preview()
+    """
+    df = parse_csv_columns(csv_file_path)
+    visits = df['Visits'].head(10) if 'Visits' in df.columns else []
+    
+    return {
+        'total_locations': len(df),
+        'states': sorted(df['State Code'].dropna().unique().tolist()),
+        'preview_locations': df.head(num_rows).to_dict('records'),
+        'columns': list(df.columns) if len(df) else [],
+        'has_metrics': any(visits)
+    }
+
+
 def export_to_csv(locations, output_path, columns=None):
     """
     Export locations back to CSV format.
@@ -453,10 +926,24 @@ def export_to_csv(locations, output_path, columns=None):
     # Remove internal columns (starting with _)
     columns = [col for col in columns if not col.startswith('_')]
     
-    with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=columns, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(locations)
+    # Written to a temporary name and swapped into place, so a reader never
+    # sees a half-written export
+    temp_path = f'{output_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    try:
+        with open(temp_path, 'w', newline='', encoding='utf-8-sig',
+                  buffering=CSV_WRITE_BUFFER_SIZE) as csvfile:
+            # Rows are laid out directly in column order (missing values blank,
+            # extra keys ignored, as csv.DictWriter with extrasaction='ignore')
+            writer = csv.writer(csvfile)
+            writer.writerow(columns)
+            writer.writerows([loc.get(col, '') for col in columns] for loc in locations)
+        os.replace(temp_path, output_path)
+    except Exception:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
     
     logger.info(f"Exported {len(locations)} locations to {output_path}")
     
@@ -24,10 +24,21 @@ import logging
 import re
 from typing import List, Dict, Tuple, Any
 
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; per-state sums fall back to plain loops
+    np = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Date range in Placer.ai export file names (Month_Day__Year_-_Month_Day__Year), e.g.
+# "Ranking_Index_-_7_Brew_Coffee_-_Oct_1__2024_-_Sep_30__2025.csv"
+SOURCE_FILE_DATE_RANGE_PATTERN = re.compile(
+    r'([A-Z][a-z]{2})_(\d{1,2})__(\d{4})_-_([A-Z][a-z]{2})_(\d{1,2})__(\d{4})'
+)
+
 
 def merge_datasets(csv_locations, kmz_existing, kmz_proposed, matches):
     """
@@ -59,8 +70,11 @@ def merge_datasets(csv_locations, kmz_existing, kmz_proposed, matches):
                 f"{len(kmz_proposed)} KMZ proposed, {len(matches)} matches")
     
     # 1. ADD ALL CSV LOCATIONS (highest priority - actual data with metrics)
+    # Entries are indexed by the identity of their CSV dict so matches can be
+    # tagged without searching (and deep-comparing) the whole list
+    csv_entries = {}
     for csv_loc in csv_locations:
-        final_locations.append({
+        entry = {
             'source': 'csv',
             'data': csv_loc,
             'is_actual': True,
@@ -68,20 +82,20 @@ def merge_datasets(csv_locations, kmz_existing, kmz_proposed, matches):
             'rank': csv_loc.get('Rank'),
             'confidence': 1.0,
             'matched_proposed': None  # Track if this replaced a proposed location
-        })
+        }
+        final_locations.append(entry)
+        csv_entries.setdefault(id(csv_loc), entry)
     
     # Tag CSV locations that replaced proposed locations
     for match in matches:
         csv_loc, kmz_loc, confidence, distance = match
-        # Find the CSV location in final_locations and tag it
-        for final_loc in final_locations:
-            if final_loc['source'] == 'csv' and final_loc['data'] == csv_loc:
-                final_loc['matched_proposed'] = {
-                    'name': kmz_loc['name'],
-                    'distance': distance,
-                    'confidence': confidence
-                }
-                break
+        final_loc = csv_entries.get(id(csv_loc))
+        if final_loc is not None:
+            final_loc['matched_proposed'] = {
+                'name': kmz_loc['name'],
+                'distance': distance,
+                'confidence': confidence
+            }
     
     logger.info(f"Added {len(csv_locations)} CSV locations")
     
@@ -411,7 +425,7 @@ def validate_merged_data(final_locations):
         if lat == 0 and lon == 0:
             errors.append(f"Location {idx+1} ({data.get('Property Name')}): Invalid coordinates (0,0)")
         
-        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+        if not (abs(lat) <= 90 and abs(lon) <= 180):
             errors.append(f"Location {idx+1} ({data.get('Property Name')}): "
                         f"Coordinates out of range ({lat}, {lon})")
     
@@ -442,48 +456,50 @@ def calculate_state_statistics(final_locations):
             - total_visits_by_state (dict): Total visits per state
             - states (list): List of unique state codes
     """
-    state_counts = {}
+    # Gather the columns the statistics need in one pass; states are numbered
+    # in first-seen order (separately for visits) so the result dicts keep
+    # the order they had when built incrementally
+    state_index = {}
+    state_ids = []
+    visit_state_index = {}
+    visit_state_ids = []
+    visit_values = []
     total_ranked = 0
-    total_ranked_us = 0
-    total_stores_us = 0
-    
-    # Track visits by state for average calculation
-    visits_by_state = {}  # state -> list of visit counts
-    total_visits_by_state = {}  # state -> sum of all visits
     
     for loc in final_locations:
         data = loc['data']
         state = data.get('State Code', data.get('State', 'Unknown'))
-        
-        # Count stores per state
-        state_counts[state] = state_counts.get(state, 0) + 1
-        total_stores_us += 1
+        state_id = state_index.setdefault(state, len(state_index))
+        state_ids.append(state_id)
         
         # Count ranked stores (those with Placer.ai rank data)
         if data.get('Rank') is not None:
             total_ranked += 1
-            total_ranked_us += 1
         
         # Track visits for average calculation
         visits = data.get('Visits')
         if visits is not None:
             try:
-                visits_value = float(visits)
-                if state not in visits_by_state:
-                    visits_by_state[state] = []
-                    total_visits_by_state[state] = 0
-                visits_by_state[state].append(visits_value)
-                total_visits_by_state[state] += visits_value
+                visit_values.append(float(visits))
             except (ValueError, TypeError):
-                pass
-    
-    # Calculate average visits per state
-    average_visits_by_state = {}
-    for state, visit_list in visits_by_state.items():
-        if visit_list:
-            average_visits_by_state[state] = sum(visit_list) / len(visit_list)
-        else:
-            average_visits_by_state[state] = 0
+                continue
+            visit_state_ids.append(visit_state_index.setdefault(state, len(visit_state_index)))
+    
+    states = list(state_index)
+    visit_states = list(visit_state_index)
+    store_counts, _ = _sum_by_group(state_ids, None, len(states))
+    visit_counts, visit_totals = _sum_by_group(visit_state_ids, visit_values, len(visit_states))
+    
+    state_counts = dict(zip(states, store_counts))
+    total_ranked_us = total_ranked
+    total_stores_us = len(state_ids)
+    
+    # Total and average visits per state, for states with any visit data
+    total_visits_by_state = dict(zip(visit_states, visit_totals))
+    average_visits_by_state = {
+        state: total / count
+        for state, count, total in zip(visit_states, visit_counts, visit_totals)
+    }
     
     return {
         'state_store_counts': state_counts,
@@ -496,6 +512,43 @@ def calculate_state_statistics(final_locations):
     }
 
 
+def _sum_by_group(group_ids, values, group_count):
+    """
+    Count and sum values per group id.
+    
+    Sums are accumulated in input order, so they equal adding the values up
+    one at a time in a loop.
+    
+    Args:
+        group_ids (list): Group id (0 to group_count - 1) for each value
+        values (list): Float values to sum, or None to only count
+        group_count (int): Number of groups
+    
+    Returns:
+        tuple: (counts, sums) lists indexed by group id; sums is None when
+            values is None
+    """
+    if np is not None:
+        ids = np.asarray(group_ids, dtype=np.intp)
+        counts = np.bincount(ids, minlength=group_count).tolist()
+        if values is None:
+            return counts, None
+        sums = np.bincount(ids, weights=np.asarray(values, dtype=np.float64),
+                           minlength=group_count).tolist()
+        return counts, sums
+    
+    counts = [0] * group_count
+    for group_id in group_ids:
+        counts[group_id] += 1
+    if values is None:
+        return counts, None
+    
+    sums = [0.0] * group_count
+    for group_id, value in zip(group_ids, values):
+        sums[group_id] += value
+    return counts, sums
+
+
 def prepare_kmz_metadata(final_locations, date_range=None):
     """
     Prepare metadata dict for KMZ generation.
@@ -546,6 +599,7 @@ def infer_date_range_from_locations(final_locations):
         str: Date range string or None if cannot be inferred
     """
     # Check if any location has date range metadata
+    checked_source_files = set()
     for loc in final_locations:
         data = loc['data']
         
@@ -555,16 +609,14 @@ def infer_date_range_from_locations(final_locations):
             if date_range:
                 return date_range
         
-        # Check source file name for date patterns
+        # Check source file name for date patterns; locations from the same
+        # file share a name, so each name is only searched once
         source_file = data.get('_source_file', '')
+        if source_file in checked_source_files:
+            continue
+        checked_source_files.add(source_file)
         
-        # Common patterns in Placer.ai exports:
-        # "Ranking_Index_-_7_Brew_Coffee_-_Oct_1__2024_-_Sep_30__2025.csv"
-        import re
-        
-        # Pattern: Month_Day__Year_-_Month_Day__Year
-        pattern = r'([A-Z][a-z]{2})_(\d{1,2})__(\d{4})_-_([A-Z][a-z]{2})_(\d{1,2})__(\d{4})'
-        match = re.search(pattern, source_file)
+        match = SOURCE_FILE_DATE_RANGE_PATTERN.search(source_file)
         
         if match:
             start_month, start_day, start_year = match.group(1), match.group(2), match.group(3)
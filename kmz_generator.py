@@ -30,23 +30,58 @@ Date: November 2, 2025
 Version: 1.1
 """
 
+import io
 import logging
-from xml.etree import ElementTree as ET
-from zipfile import ZipFile
+from functools import lru_cache
+from zipfile import ZipFile, ZIP_STORED
 import os
+import shutil
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; bulk validation falls back to pure Python
+    np = None
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Fields every location needs before it can become a placemark
+REQUIRED_LOCATION_FIELDS = ['Property Name', 'Latitude', 'Longitude', 'City', 'State']
+
+KML_NAMESPACE = 'http://www.opengis.net/kml/2.2'
+
+# Fixed parts of every KML document, around the per-file name and schema
+KML_PROLOG = f'<?xml version="1.0" encoding="UTF-8"?>\n<kml xmlns="{KML_NAMESPACE}"><Document>'
+KML_DEFAULT_STYLE = (
+    '<Style id="defaultStyle"><IconStyle><Icon>'
+    '<href>http://maps.google.com/mapfiles/kml/paddle/red-circle.png</href>'
+    '</Icon></IconStyle></Style>'
+)
+KML_EPILOG = '</Document></kml>'
+
+# Buffer between the KML generator and the zip member, so the compressor
+# sees large writes instead of one small write per placemark
+KML_WRITE_BUFFER_SIZE = 256 * 1024
+
 
-def generate_kmz(locations, output_path, metadata=None):
+def generate_kmz(locations, output_path, metadata=None, compression=ZIP_STORED,
+                 compresslevel=None):
     """
     Generate a KMZ file with placemarks for all locations.
     
+    doc.kml is stored uncompressed by default, which is the fastest to write
+    and to re-read. Pass compression=zipfile.ZIP_DEFLATED for smaller files;
+    compresslevel=1 keeps most of the size win at a fraction of the CPU cost
+    of zlib's default level 6.
+    
     Args:
         locations (list): List of location dicts with all required fields
-        output_path (str): Path where KMZ file should be saved
+        output_path (str or file-like): Path where KMZ file should be saved,
+            or a writable binary file object (e.g. io.BytesIO) to build the
+            KMZ in memory without touching the disk. The file object need
+            not be seekable, so the KMZ can be streamed straight into a pipe
+            or upload as it is generated
         metadata (dict): Optional metadata including:
             - date_range (str): e.g., "Apr 1 - Jun 2023"
             - total_ranked_stores (int): Total number of ranked stores
@@ -55,9 +90,11 @@ def generate_kmz(locations, output_path, metadata=None):
             - state_store_counts (dict): Store count per state
             - average_visits_by_state (dict): Average visits per state
             - total_visits_by_state (dict): Total visits per state
+        compression (int): zipfile compression method for doc.kml
+        compresslevel (int): Compression level, or None for the method's default
     
     Returns:
-        str: Path to generated KMZ file
+        str or file-like: output_path, once the KMZ has been written to it
     """
     logger.info(f"Generating KMZ file: {output_path}")
     logger.info(f"Total locations: {len(locations)}")
@@ -82,23 +119,13 @@ def generate_kmz(locations, output_path, metadata=None):
             state_counts[state] = state_counts.get(state, 0) + 1
         metadata['state_store_counts'] = state_counts
     
-    # Generate KML content
-    kml_content = generate_kml(locations, metadata)
-    
-    # Create KMZ file (KMZ is a ZIP file containing doc.kml)
-    temp_kml_path = output_path.replace('.kmz', '_temp.kml')
-    
-    # Write KML to temporary file
-    with open(temp_kml_path, 'w', encoding='utf-8') as f:
-        f.write(kml_content)
-    
-    # Create KMZ (ZIP) file
-    with ZipFile(output_path, 'w') as kmz:
-        kmz.write(temp_kml_path, 'doc.kml')
-    
-    # Clean up temporary KML file
-    if os.path.exists(temp_kml_path):
-        os.remove(temp_kml_path)
+    # Create KMZ file (KMZ is a ZIP file containing doc.kml), streaming the
+    # KML into the archive member so the whole document is never in memory
+    with ZipFile(output_path, 'w', compression=compression, compresslevel=compresslevel) as kmz:
+        with kmz.open('doc.kml', 'w') as member:
+            with io.BufferedWriter(member, buffer_size=KML_WRITE_BUFFER_SIZE) as out:
+                for chunk in iter_kml(locations, metadata):
+                    out.write(chunk.encode('utf-8'))
     
     logger.info(f"KMZ file generated successfully: {output_path}")
     
@@ -116,57 +143,102 @@ def generate_kml(locations, metadata):
     Returns:
         str: KML XML content as string
     """
-    # Create root KML element
-    kml = ET.Element('kml', xmlns='http://www.opengis.net/kml/2.2')
-    document = ET.SubElement(kml, 'Document')
-    
-    # Add document name
-    name = ET.SubElement(document, 'name')
-    name.text = f"Locations - {metadata.get('date_range', 'Unknown Date Range')}"
-    
-    # Add style for placemarks
-    style = ET.SubElement(document, 'Style', id='defaultStyle')
-    icon_style = ET.SubElement(style, 'IconStyle')
-    icon = ET.SubElement(icon_style, 'Icon')
-    href = ET.SubElement(icon, 'href')
-    href.text = 'http://maps.google.com/mapfiles/kml/paddle/red-circle.png'
-    
-    # Create schema for extended data
+    return ''.join(iter_kml(locations, metadata))
+
+
+def iter_kml(locations, metadata):
+    """
+    Generate KML XML content piece by piece.
+    
+    The document is written directly as text rather than built up as an
+    ElementTree, and each placemark is yielded as soon as it is built, so
+    callers can stream the document out without holding all of it.
+    
+    Args:
+        locations (iterable): Location dicts
+        metadata (dict): Metadata for the KML file
+    
+    Yields:
+        str: Consecutive chunks of the KML document
+    """
     date_range = metadata.get('date_range', 'Oct 1, 2024 - Sep 30, 2025')
-    schema = create_schema(document, date_range)
+    schema_id = 'LocationDataSchema'
+    
+    yield ''.join([
+        KML_PROLOG,
+        _text_element('name', f"Locations - {metadata.get('date_range', 'Unknown Date Range')}"),
+        KML_DEFAULT_STYLE,
+        create_schema(date_range, schema_id),
+    ])
+    
+    # Per-state values are the same for every placemark in a state
+    state_fields = state_field_values(metadata)
     
     # Add placemark for each location
     for loc in locations:
-        create_placemark(document, loc, metadata, schema.get('id'))
+        yield create_placemark(loc, metadata, schema_id, state_fields)
     
-    # Convert to string with XML declaration
-    xml_string = ET.tostring(kml, encoding='utf-8', method='xml').decode('utf-8')
+    yield KML_EPILOG
+
+
+def _escape_text(text):
+    """Escape element text the same way ElementTree does."""
+    if '&' in text:
+        text = text.replace('&', '&amp;')
+    if '<' in text:
+        text = text.replace('<', '&lt;')
+    if '>' in text:
+        text = text.replace('>', '&gt;')
+    return text
+
+
+def _escape_attr(text):
+    """Escape an attribute value the same way ElementTree does."""
+    text = _escape_text(text)
+    if '"' in text:
+        text = text.replace('"', '&quot;')
+    if '\r' in text:
+        text = text.replace('\r', '&#13;')
+    if '\n' in text:
+        text = text.replace('\n', '&#10;')
+    if '\t' in text:
+        text = text.replace('\t', '&#09;')
+    return text
+
+
+def _text_element(tag, text, attrs=''):
+    """
+    Serialize a leaf element, self-closing it when there is no text.
     
-    # Add XML declaration
-    full_xml = '<?xml version="1.0" encoding="UTF-8"?>\n' + xml_string
+    Args:
+        tag (str): Element tag name
+        text: Element text (empty or None produces a self-closing tag)
+        attrs (str): Pre-escaped attribute string, including the leading space
     
-    return full_xml
+    Returns:
+        str: Element markup
+    """
+    if not text:
+        return f'<{tag}{attrs} />'
+    return f'<{tag}{attrs}>{_escape_value(str(text))}</{tag}>'
 
 
-def create_schema(parent, date_range='Oct 1, 2024 - Sep 30, 2025'):
+# Cell values repeat heavily across placemarks (cities, states, 'N/A')
+_escape_value = lru_cache(maxsize=4096)(_escape_text)
+
+
+def schema_fields(date_range='Oct 1, 2024 - Sep 30, 2025'):
     """
-    Create schema definition for extended data fields.
+    Get the extended data fields shown in the information bubble.
     
     Args:
-        parent (ET.Element): Parent XML element (Document)
         date_range (str): Date range to include in field names
     
     Returns:
-        ET.Element: Schema element
+        list: (field_name, field_type) tuples in display order
     """
-    schema = ET.SubElement(parent, 'Schema', {
-        'name': 'LocationData',
-        'id': 'LocationDataSchema'
-    })
-    
-    # Define all simple fields that will appear in the information bubble
     # Date ranges are in the FIELD NAMES, not the values
-    fields = [
+    return [
         ('Name', 'string'),
         ('Address', 'string'),
         ('City', 'string'),
@@ -186,107 +258,191 @@ def create_schema(parent, date_range='Oct 1, 2024 - Sep 30, 2025'):
         ('Lat', 'double'),
         ('Long', 'double')
     ]
+
+
+@lru_cache(maxsize=32)
+def create_schema(date_range='Oct 1, 2024 - Sep 30, 2025', schema_id='LocationDataSchema'):
+    """
+    Create schema definition for extended data fields.
+    
+    The markup is cached per date range and schema ID, so the per-state
+    files of one job share a single copy.
     
-    for field_name, field_type in fields:
-        ET.SubElement(schema, 'SimpleField', {
-            'name': field_name,
-            'type': field_type
-        })
+    Args:
+        date_range (str): Date range to include in field names
+        schema_id (str): Schema ID placemarks refer to
+    
+    Returns:
+        str: Schema element markup
+    """
+    parts = [f'<Schema name="LocationData" id="{_escape_attr(schema_id)}">']
+    for field_name, field_type in schema_fields(date_range):
+        parts.append(f'<SimpleField name="{_escape_attr(field_name)}" type="{field_type}" />')
+    parts.append('</Schema>')
     
-    return schema
+    return ''.join(parts)
 
 
-def create_placemark(parent, location, metadata, schema_id):
+@lru_cache(maxsize=32)
+def _placemark_template(date_range, schema_id):
+    """
+    Build the %-format template for a placemark.
+    
+    Everything that is the same for every placemark (the escaped field
+    names, styleUrl, schema reference) is baked into the template once per
+    date range, leaving slots for the name element, the tail of each
+    SimpleData tag ('>value</SimpleData>' or ' />') and the coordinates.
+    
+    Args:
+        date_range (str): Date range included in field names
+        schema_id (str): Schema ID reference
+    
+    Returns:
+        str: Template with 1 + len(schema_fields()) + 2 '%s' slots
+    """
+    parts = [
+        '<Placemark>%s<styleUrl>#defaultStyle</styleUrl>',
+        f'<ExtendedData><SchemaData schemaUrl="#{_escape_attr(schema_id)}">'.replace('%', '%%'),
+    ]
+    for field_name, _ in schema_fields(date_range):
+        parts.append(f'<SimpleData name="{_escape_attr(field_name)}"'.replace('%', '%%') + '%s')
+    parts.append('</SchemaData></ExtendedData><Point><coordinates>%s,%s,0</coordinates></Point></Placemark>')
+    
+    return ''.join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _format_count(value):
+    """
+    Format a count with thousands separators, or 'N/A' when missing.
+    
+    Cached because square footages and the per-state visit figures repeat
+    across stores.
+    
+    Args:
+        value: Number or numeric string (truncated to an integer)
+    
+    Returns:
+        str: Formatted count (e.g., "12,345") or 'N/A'
+    """
+    if not value:
+        return 'N/A'
+    try:
+        return f"{int(value):,}"
+    except (ValueError, TypeError):
+        return 'N/A'
+
+
+@lru_cache(maxsize=4096)
+def _format_county(county):
+    """
+    Format a county name for display: ALL CAPS, without a County/Parish suffix.
+    
+    Cached because locations share a small set of county names.
+    
+    Args:
+        county (str): County name from the lookup (e.g., "Fulton County")
+    
+    Returns:
+        str: Display name (e.g., "FULTON")
+    """
+    county = county.upper()
+    if county.endswith(' COUNTY'):
+        county = county.replace(' COUNTY', '')
+    if county.endswith(' PARISH'):
+        county = county.replace(' PARISH', '')
+    return county
+
+
+def state_field_values(metadata):
+    """
+    Preformat the per-state placemark fields for every state in the metadata.
+    
+    Args:
+        metadata (dict): Metadata including state counts and visit totals
+    
+    Returns:
+        dict: Mapping of state code -> (store count, total visits,
+            average visits) display strings
+    """
+    state_codes = {
+        *metadata.get('state_store_counts', {}),
+        *metadata.get('total_visits_by_state', {}),
+        *metadata.get('average_visits_by_state', {}),
+    }
+    return {state_code: _state_values(metadata, state_code) for state_code in state_codes}
+
+
+def _state_values(metadata, state_code):
+    """
+    Format the per-state placemark fields for one state.
+    
+    Args:
+        metadata (dict): Metadata including state counts and visit totals
+        state_code (str): State code
+    
+    Returns:
+        tuple: (store count, total visits, average visits) display strings
+    """
+    state_store_count = metadata.get('state_store_counts', {}).get(state_code, 0)
+    total_visits_state = metadata.get('total_visits_by_state', {}).get(state_code, 0)
+    average_visits_state = metadata.get('average_visits_by_state', {}).get(state_code, 0)
+    
+    return (
+        str(state_store_count),
+        _format_count(total_visits_state),
+        _format_count(average_visits_state),
+    )
+
+
+def create_placemark(location, metadata, schema_id, state_fields=None):
     """
     Create a placemark for a single location with all extended data.
     
     Args:
-        parent (ET.Element): Parent XML element (Document)
         location (dict): Location data
         metadata (dict): Metadata including date ranges and counts
         schema_id (str): Schema ID reference
+        state_fields (dict): Optional output of state_field_values(metadata),
+            so per-state values aren't reformatted for every placemark
     
     Returns:
-        ET.Element: Placemark element
+        str: Placemark element markup
     """
-    placemark = ET.SubElement(parent, 'Placemark')
-    
     # Placemark name (displays as title in Google Earth)
-    name = ET.SubElement(placemark, 'name')
     property_name = location.get('Property Name', location.get('name', 'Unknown'))
     city = location.get('City', '')
     state = location.get('State Code', location.get('State', ''))
-    name.text = f"{property_name} - {city}, {state}" if city and state else property_name
-    
-    # Style reference
-    style_url = ET.SubElement(placemark, 'styleUrl')
-    style_url.text = '#defaultStyle'
-    
-    # Extended Data (this is what shows in the information bubble)
-    extended_data = ET.SubElement(placemark, 'ExtendedData')
-    schema_data = ET.SubElement(extended_data, 'SchemaData', {
-        'schemaUrl': f'#{schema_id}'
-    })
+    placemark_name = f"{property_name} - {city}, {state}" if city and state else property_name
     
     # Get metadata values
     date_range = metadata.get('date_range', 'Oct 1, 2024 - Sep 30, 2025')
     total_ranked_stores_us = metadata.get('total_ranked_stores_us', 0)
     total_stores_us = metadata.get('total_stores_us', 0)
     state_code = location.get('State Code', location.get('State', ''))
-    state_store_count = metadata.get('state_store_counts', {}).get(state_code, 0)
-    average_visits_state = metadata.get('average_visits_by_state', {}).get(state_code, 0)
-    total_visits_state = metadata.get('total_visits_by_state', {}).get(state_code, 0)
+    if state_fields is not None and state_code in state_fields:
+        state_store_count, total_visits_formatted, avg_visits_formatted = state_fields[state_code]
+    else:
+        state_store_count, total_visits_formatted, avg_visits_formatted = _state_values(
+            metadata, state_code
+        )
     
     # Format county - ALL CAPS, remove " County" suffix if present
     county = location.get('County', '')
     if county:
-        county = county.upper()
-        if county.endswith(' COUNTY'):
-            county = county.replace(' COUNTY', '')
-        if county.endswith(' PARISH'):
-            county = county.replace(' PARISH', '')
+        county = _format_county(county)
     
     # Get rank (state-level)
     rank = location.get('Rank')
     rank_display = str(rank) if rank is not None else 'N/A'
     
-    # Format visits with commas
+    # Format visits and square footage with commas
     visits = location.get('Visits')
-    if visits:
-        try:
-            visits_formatted = f"{int(visits):,}"
-        except (ValueError, TypeError):
-            visits_formatted = 'N/A'
-    else:
-        visits_formatted = 'N/A'
-    
-    # Format average visits with commas
-    if average_visits_state:
-        try:
-            avg_visits_formatted = f"{int(average_visits_state):,}"
-        except (ValueError, TypeError):
-            avg_visits_formatted = 'N/A'
-    else:
-        avg_visits_formatted = 'N/A'
-    
-    # Format total visits for state
-    if total_visits_state:
-        try:
-            total_visits_formatted = f"{int(total_visits_state):,}"
-        except (ValueError, TypeError):
-            total_visits_formatted = 'N/A'
-    else:
-        total_visits_formatted = 'N/A'
+    visits_formatted = _format_count(visits)
     
     # Get square footage
     sq_ft = location.get('sq ft')
-    if sq_ft:
-        try:
-            sq_ft_formatted = f"{int(sq_ft):,}"
-        except (ValueError, TypeError):
-            sq_ft_formatted = 'N/A'
-    else:
-        sq_ft_formatted = 'N/A'
+    sq_ft_formatted = _format_count(sq_ft)
     
     # Calculate Sales Per SF (Visits / sq ft)
     sales_per_sf = location.get('Visits / sq ft')
@@ -311,45 +467,50 @@ def create_placemark(parent, location, metadata, schema_id):
     # This would need additional logic to determine US rank vs state rank
     rank_us_display = rank_display  # Placeholder - would need proper US ranking logic
     
-    # Build the exact field structure matching the screenshot
+    # Build the exact field structure matching the screenshot, in the same
+    # order as schema_fields() (Lat/Long are added after the loop below)
     # NOTE: Date ranges are in FIELD NAMES (in schema), not in values
-    fields_data = [
-        ('Name', property_name),
-        ('Address', location.get('Address', '')),
-        ('City', city),
-        ('State', state),
-        ('Zip', location.get('Zip Code', location.get('Zip', ''))),
-        ('County', county),
-        (f'Placer Rank [State Code] ({date_range})', rank_display),
-        ('Ranked Stores [State Code]', str(state_store_count)),
-        (f'Total Visits [State Code] ({date_range})', total_visits_formatted),
-        (f'Average Total Visits [State Code] ({date_range})', avg_visits_formatted),
-        ('Total Stores [State Code]', str(state_store_count)),
-        (f'Placer Rank US ({date_range})', rank_us_display),
-        ('Ranked Stores US', str(total_ranked_stores_us)),
-        ('Total Stores US', str(total_stores_us)),
-        ('SF', sq_ft_formatted),
-        ('Sales Per SF', sales_per_sf_formatted),
-        ('Lat', str(location.get('Latitude', 0.0))),
-        ('Long', str(location.get('Longitude', 0.0)))
+    field_values = [
+        property_name,
+        location.get('Address', ''),
+        city,
+        state,
+        location.get('Zip Code', location.get('Zip', '')),
+        county,
+        rank_display,
+        state_store_count,
+        total_visits_formatted,
+        avg_visits_formatted,
+        state_store_count,
+        rank_us_display,
+        str(total_ranked_stores_us),
+        str(total_stores_us),
+        sq_ft_formatted,
+        sales_per_sf_formatted
     ]
     
-    # Add each field as SimpleData
-    for field_name, field_value in fields_data:
-        simple_data = ET.SubElement(schema_data, 'SimpleData', {'name': field_name})
-        simple_data.text = str(field_value) if field_value else ''
+    # Coordinates are formatted once and shared by the Lat/Long fields and <coordinates>
+    lat_text = _escape_text(str(location.get('Latitude', 0.0)))
+    lon_text = _escape_text(str(location.get('Longitude', 0.0)))
+    
+    # Tail of each SimpleData tag; empty values self-close
+    slots = [_text_element('name', placemark_name)]
+    for field_value in field_values:
+        slots.append(f'>{_escape_value(str(field_value))}</SimpleData>' if field_value else ' />')
+    
+    # Lat/Long are unique per placemark, so they bypass the escape cache
+    for text in (lat_text, lon_text):
+        slots.append(f'>{text}</SimpleData>' if text else ' />')
     
     # Point coordinates
-    point = ET.SubElement(placemark, 'Point')
-    coordinates = ET.SubElement(point, 'coordinates')
-    lon = location.get('Longitude', 0.0)
-    lat = location.get('Latitude', 0.0)
-    coordinates.text = f"{lon},{lat},0"
+    slots.append(lon_text)
+    slots.append(lat_text)
     
-    return placemark
+    return _placemark_template(date_range, schema_id) % tuple(slots)
 
 
-def generate_state_kmz_files(locations, output_directory, metadata=None):
+def generate_state_kmz_files(locations, output_directory, metadata=None, compression=ZIP_STORED,
+                             compresslevel=None):
     """
     Generate separate KMZ files for each state.
     
@@ -357,6 +518,8 @@ def generate_state_kmz_files(locations, output_directory, metadata=None):
         locations (list): List of all locations
         output_directory (str): Directory where KMZ files should be saved
         metadata (dict): Metadata for KML generation
+        compression (int): zipfile compression method passed to generate_kmz
+        compresslevel (int): Compression level passed to generate_kmz
     
     Returns:
         dict: Mapping of state code -> KMZ file path
@@ -387,7 +550,8 @@ def generate_state_kmz_files(locations, output_directory, metadata=None):
         # The state_store_counts should already have the correct count for this state
         
         # Generate KMZ
-        generate_kmz(state_locations, output_path, state_metadata)
+        generate_kmz(state_locations, output_path, state_metadata,
+                     compression=compression, compresslevel=compresslevel)
         generated_files[state] = output_path
         
         logger.info(f"Generated {state}.kmz with {len(state_locations)} locations")
@@ -407,10 +571,9 @@ def validate_location_data(location):
     Returns:
         tuple: (is_valid, missing_fields)
     """
-    required_fields = ['Property Name', 'Latitude', 'Longitude', 'City', 'State']
     missing_fields = []
     
-    for field in required_fields:
+    for field in REQUIRED_LOCATION_FIELDS:
         # Check both possible field name variations
         if not location.get(field) and not location.get(field.replace(' ', '_')):
             missing_fields.append(field)
@@ -424,7 +587,7 @@ def validate_location_data(location):
         lon = float(lon)
         if lat == 0 and lon == 0:
             missing_fields.append('Valid coordinates')
-        if not (-90 <= lat <= 90) or not (-180 <= lon <= 180):
+        if not (abs(lat) <= 90 and abs(lon) <= 180):
             missing_fields.append('Coordinate range')
     except (ValueError, TypeError):
         missing_fields.append('Numeric coordinates')
@@ -434,8 +597,53 @@ def validate_location_data(location):
     return is_valid, missing_fields
 
 
+def validate_locations_bulk(locations):
+    """
+    Validate many locations at once, applying the same rules as validate_location_data.
+    
+    Coordinate parsing still happens per location, but the zero and range checks run
+    as vectorized NumPy comparisons over the whole batch when NumPy is installed.
+    
+    Args:
+        locations (list): List of location dicts
+    
+    Returns:
+        sequence: One boolean per location (NumPy array, or list without NumPy).
+            Filter with itertools.compress(locations, mask).
+    """
+    if np is None:
+        return [validate_location_data(loc)[0] for loc in locations]
+    
+    count = len(locations)
+    lat = np.fromiter((_coordinate_or_nan(loc.get('Latitude', 0)) for loc in locations),
+                      dtype=np.float64, count=count)
+    lon = np.fromiter((_coordinate_or_nan(loc.get('Longitude', 0)) for loc in locations),
+                      dtype=np.float64, count=count)
+    has_fields = np.fromiter(
+        (all(loc.get(field) or loc.get(field.replace(' ', '_'))
+             for field in REQUIRED_LOCATION_FIELDS)
+         for loc in locations),
+        dtype=bool, count=count
+    )
+    
+    # NaN (unparseable) coordinates fail the range comparisons below
+    valid = has_fields & ((lat != 0) | (lon != 0))
+    valid &= (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
+    
+    return valid
+
+
+def _coordinate_or_nan(value):
+    """Convert a coordinate to float, mapping unparseable values to NaN."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return float('nan')
+
+
 # Example usage and testing
-if __name__ == "__main__":
+def _run_selftest():
+    """Generate sample KMZ files and check their structure."""
     print("\n" + "=" * 80)
     print("KMZ GENERATOR TEST")
     print("=" * 80 + "\n")
@@ -516,6 +724,8 @@ if __name__ == "__main__":
         print(f"   {status} Location {idx}: {loc['Property Name']}")
         if missing:
             print(f"      Missing: {', '.join(missing)}")
+    valid_mask = validate_locations_bulk(test_locations)
+    print(f"   Bulk check: {sum(bool(v) for v in valid_mask)}/{len(test_locations)} valid")
     
     print("\n2. Generating single KMZ file...")
     output_path = 'test_all_locations.kmz'
@@ -570,7 +780,6 @@ if __name__ == "__main__":
         print(f"   ✓ Removed {output_path}")
     
     if os.path.exists(output_dir):
-        import shutil
         shutil.rmtree(output_dir)
         print(f"   ✓ Removed {output_dir}")
     
@@ -592,3 +801,7 @@ if __name__ == "__main__":
     print("  • Total Stores [State Code] count")
     print("  • Proper KML structure for Google Earth Pro")
     print("  • Extended data fields match requirements exactly")
+
+
+if __name__ == "__main__":
+    _run_selftest()
@@ -16,13 +16,50 @@ Version: 1.0
 
 from xml.etree import ElementTree as ET
 from zipfile import ZipFile
+from itertools import chain
+import heapq
 import os
+import re
+import sys
 import logging
 
+try:
+    from lxml import etree as lxml_etree
+except ImportError:  # lxml is optional; the stdlib parser is used without it
+    lxml_etree = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# KML namespace and the fully qualified tags looked up in every placemark, so
+# no prefixed path has to be resolved per lookup
+KML_NAMESPACE = 'http://www.opengis.net/kml/2.2'
+PLACEMARK_TAG = f'{{{KML_NAMESPACE}}}Placemark'
+EXTENDED_DATA_TAG = f'{{{KML_NAMESPACE}}}ExtendedData'
+SIMPLE_DATA_TAG = f'{{{KML_NAMESPACE}}}SimpleData'
+NAME_TAG = f'{{{KML_NAMESPACE}}}name'
+SHORT_NAME_TAG = f'{{{KML_NAMESPACE}}}n'
+COORDINATES_TAG = f'{{{KML_NAMESPACE}}}coordinates'
+
+# Common indicators of proposed/planned locations (matched in lowercase names)
+PROPOSED_INDICATORS = [
+    '(proposed)',
+    '(u/c)',
+    'under construction',
+    '(planned)',
+    '(future)',
+    '(coming soon)',
+    '(opening soon)',
+    '(in development)',
+    '(pending)',
+    '(future site)',
+]
+
+# All indicators in one pattern, so a name is scanned once instead of once per
+# indicator
+PROPOSED_INDICATOR_PATTERN = re.compile('|'.join(map(re.escape, PROPOSED_INDICATORS)))
+
 
 def parse_kmz(kmz_file_path):
     """
@@ -39,7 +76,8 @@ def parse_kmz(kmz_file_path):
     Raises:
         FileNotFoundError: If KMZ file doesn't exist
         zipfile.BadZipFile: If file is not a valid KMZ/ZIP
-        ET.ParseError: If KML content is invalid XML
+        ET.ParseError: If KML content is invalid XML (lxml.etree.XMLSyntaxError
+            when lxml is installed)
     """
     if not os.path.exists(kmz_file_path):
         raise FileNotFoundError(f"KMZ file not found: {kmz_file_path}")
@@ -58,29 +96,24 @@ def parse_kmz(kmz_file_path):
             
             # Use doc.kml if it exists, otherwise use first .kml file
             kml_filename = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
-            kml_content = kmz.read(kml_filename)
-        
-        # Parse XML
-        root = ET.fromstring(kml_content)
-        
-        # Define namespace (KML uses this namespace)
-        ns = {'kml': 'http://www.opengis.net/kml/2.2'}
-        
-        # Extract all placemarks
-        placemarks = root.findall('.//kml:Placemark', ns)
-        logger.info(f"Found {len(placemarks)} placemarks in KMZ file")
-        
-        for placemark in placemarks:
-            location = extract_placemark_data(placemark, ns)
             
-            # Check if this is a proposed location
-            if is_proposed_location(location['name']):
-                proposed.append(location)
-                logger.debug(f"Proposed location: {location['name']}")
-            else:
-                existing.append(location)
-                logger.debug(f"Existing location: {location['name']}")
+            # Define namespace (KML uses this namespace)
+            ns = {'kml': KML_NAMESPACE}
+            
+            # Stream placemarks straight out of the archive
+            with kmz.open(kml_filename) as kml_file:
+                for placemark in iter_placemarks(kml_file):
+                    location = extract_placemark_data(placemark, ns)
+                    
+                    # Check if this is a proposed location
+                    if is_proposed_location(location['name']):
+                        proposed.append(location)
+                        logger.debug(f"Proposed location: {location['name']}")
+                    else:
+                        existing.append(location)
+                        logger.debug(f"Existing location: {location['name']}")
         
+        logger.info(f"Found {len(proposed) + len(existing)} placemarks in KMZ file")
         logger.info(f"Categorized: {len(proposed)} proposed, {len(existing)} existing")
         
     except Exception as e:
@@ -90,6 +123,56 @@ def parse_kmz(kmz_file_path):
     return proposed, existing
 
 
+def iter_placemarks(kml_file):
+    """
+    Stream Placemark elements from a KML file in document order.
+    
+    Each Placemark is yielded once it has been fully parsed and is then
+    cleared and detached from its parent, so memory use stays at about one
+    placemark regardless of file size. Callers must copy what they need
+    before asking for the next element. Uses lxml's C parser when installed,
+    which only reports Placemark end events back to Python.
+    
+    Args:
+        kml_file (file): Binary file object with the KML content
+    
+    Yields:
+        Element: Complete Placemark elements (ElementTree or lxml)
+    
+    Raises:
+        ET.ParseError: If KML content is invalid XML (lxml.etree.XMLSyntaxError
+            when lxml is used)
+    """
+    if lxml_etree is not None:
+        # Internal entities are expanded, as the stdlib parser does; lxml's
+        # default leaves external ones unloaded and no_network blocks fetches
+        for _, elem in lxml_etree.iterparse(kml_file, events=('end',), tag=PLACEMARK_TAG,
+                                            huge_tree=True, no_network=True):
+            yield elem
+            
+            elem.clear()
+            parent = elem.getparent()
+            if parent is not None:
+                del parent[-1]
+        return
+    
+    open_elements = []
+    
+    for event, elem in ET.iterparse(kml_file, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            continue
+        
+        open_elements.pop()
+        if elem.tag == PLACEMARK_TAG:
+            yield elem
+            
+            # A finished element is always its parent's last child so far
+            elem.clear()
+            if open_elements:
+                del open_elements[-1][-1]
+
+
 def is_proposed_location(name):
     """
     Check if location name indicates it's proposed/planned/under construction.
@@ -103,23 +186,7 @@ def is_proposed_location(name):
     if not name:
         return False
     
-    name_lower = name.lower()
-    
-    # Check for common indicators of proposed/planned locations
-    indicators = [
-        '(proposed)',
-        '(u/c)',
-        'under construction',
-        '(planned)',
-        '(future)',
-        '(coming soon)',
-        '(opening soon)',
-        '(in development)',
-        '(pending)',
-        '(future site)',
-    ]
-    
-    return any(indicator in name_lower for indicator in indicators)
+    return PROPOSED_INDICATOR_PATTERN.search(name.lower()) is not None
 
 
 def extract_placemark_data(placemark, namespace):
@@ -133,7 +200,8 @@ def extract_placemark_data(placemark, namespace):
     
     Args:
         placemark (ET.Element): XML Element representing a KML Placemark
-        namespace (dict): Dictionary with KML namespace mapping
+        namespace (dict): Dictionary with KML namespace mapping (tags are
+            matched against KML_NAMESPACE)
     
     Returns:
         dict: Location data with standardized keys:
@@ -147,35 +215,43 @@ def extract_placemark_data(placemark, namespace):
             - year_opened (str): Year opened or planned
             - web_link (str): Website link if available
             - extended_data (dict): All SimpleData fields preserved
-            - original_xml (ET.Element): Original XML element for reference
     """
-    ns = namespace
-    
     # Extract name - try <n> first (used by some exports), then <name>
-    name_elem = placemark.find('kml:n', ns)
+    name_elem = placemark.find(SHORT_NAME_TAG)
     if name_elem is None:
-        name_elem = placemark.find('kml:name', ns)
+        name_elem = placemark.find(NAME_TAG)
     name = name_elem.text if name_elem is not None else "Unknown"
     
-    # Extract coordinates from <Point><coordinates>
-    coords_elem = placemark.find('.//kml:coordinates', ns)
+    # Extract coordinates from <Point><coordinates> (first one in the subtree)
+    coords_elem = next(placemark.iter(COORDINATES_TAG), None)
     coords_text = coords_elem.text.strip() if coords_elem is not None else "0,0,0"
     
     # Parse coordinates (format: "longitude,latitude,altitude")
+    # Only the first two fields are used, so the rest of the text (e.g.
+    # further coordinates of a LineString) is left unsplit
     try:
-        parts = coords_text.split(',')
-        lon = float(parts[0]) if len(parts) > 0 else 0.0
+        parts = coords_text.split(',', 2)
+        lon = float(parts[0])
         lat = float(parts[1]) if len(parts) > 1 else 0.0
-    except (ValueError, IndexError) as e:
+    except ValueError:
         logger.warning(f"Invalid coordinates for {name}: {coords_text}")
         lon, lat = 0.0, 0.0
     
-    # Extract extended data (SimpleData elements)
-    extended_data = {}
-    for simple_data in placemark.findall('.//kml:SimpleData', ns):
-        field_name = simple_data.get('name')
-        field_value = simple_data.text if simple_data.text else ''
-        extended_data[field_name] = field_value
+    # Extract extended data (SimpleData elements); only the ExtendedData
+    # subtree is walked, and placemarks without one skip the walk entirely
+    extended_data_elem = placemark.find(EXTENDED_DATA_TAG)
+    if extended_data_elem is None:
+        extended_data = {}
+    else:
+        extended_data = {
+            _intern(simple_data.get('name')): simple_data.text or ''
+            for simple_data in extended_data_elem.iter(SIMPLE_DATA_TAG)
+        }
+        
+        # City/state values repeat across placemarks too
+        for field_name in ('City', 'State'):
+            if field_name in extended_data:
+                extended_data[field_name] = sys.intern(extended_data[field_name])
     
     # Build standardized location dictionary
     location = {
@@ -188,13 +264,28 @@ def extract_placemark_data(placemark, namespace):
         'zip': extended_data.get('Zip', ''),
         'year_opened': extended_data.get('Year_opened', ''),
         'web_link': extended_data.get('Web_Link', ''),
-        'extended_data': extended_data,  # Keep all fields
-        'original_xml': placemark  # Keep original for reference/debugging
+        'extended_data': extended_data  # Keep all fields
     }
     
     return location
 
 
+def _intern(value):
+    """
+    Intern a parsed string so repeated values share one object.
+    
+    Field names (and city/state values) repeat in every placemark; interning
+    keeps one copy of each for the whole file instead of one per placemark.
+    
+    Args:
+        value (str): String to intern, or None
+    
+    Returns:
+        str: The interned string, or None
+    """
+    return sys.intern(value) if value is not None else None
+
+
 def get_kmz_stats(kmz_file_path):
     """
     Get quick statistics about a KMZ file without full parsing.
@@ -213,20 +304,28 @@ def get_kmz_stats(kmz_file_path):
     try:
         proposed, existing = parse_kmz(kmz_file_path)
         
+        # One walk over every location collects all three summaries
+        has_extended_data = False
+        states = set()
+        cities = set()
+        for loc in chain(proposed, existing):
+            if loc.get('extended_data'):
+                has_extended_data = True
+            state = loc.get('state')
+            if state:
+                states.add(state)
+                city = loc.get('city')
+                if city:
+                    cities.add(f"{city}, {state}")
+        
         stats = {
             'total_placemarks': len(proposed) + len(existing),
             'proposed_count': len(proposed),
             'existing_count': len(existing),
-            'has_extended_data': any('extended_data' in loc and loc['extended_data'] 
-                                    for loc in proposed + existing),
-            'states': sorted(list(set(
-                loc['state'] for loc in proposed + existing 
-                if loc.get('state')
-            ))),
-            'cities': sorted(list(set(
-                f"{loc['city']}, {loc['state']}" for loc in proposed + existing 
-                if loc.get('city') and loc.get('state')
-            )))[:20]  # Limit to 20 cities for preview
+            'has_extended_data': has_extended_data,
+            'states': sorted(states),
+            # Limit to 20 cities for preview, without sorting all of them
+            'cities': heapq.nsmallest(20, cities)
         }
         
         return stats
@@ -276,10 +375,9 @@ def validate_kmz_file(kmz_file_path, max_size_mb=10):
     except Exception as e:
         return False, f"Invalid KMZ file: {str(e)}"
     
-    # Try to parse the KML
+    # Try to parse the KML, stopping at the first placemark
     try:
-        proposed, existing = parse_kmz(kmz_file_path)
-        if len(proposed) + len(existing) == 0:
+        if _count_placemarks(kmz_file_path, limit=1) == 0:
             return False, "No placemarks found in KMZ file"
     except Exception as e:
         return False, f"Error parsing KML: {str(e)}"
@@ -287,10 +385,35 @@ def validate_kmz_file(kmz_file_path, max_size_mb=10):
     return True, None
 
 
+def _count_placemarks(kmz_file_path, limit=None):
+    """
+    Count the placemarks in a KMZ file's KML without extracting their data.
+    
+    Args:
+        kmz_file_path (str): Path to the KMZ file
+        limit (int): Stop counting once this many are found (default: count all)
+    
+    Returns:
+        int: Number of placemarks found, at most limit
+    """
+    count = 0
+    with ZipFile(kmz_file_path, 'r') as kmz:
+        kml_files = [f for f in kmz.namelist() if f.endswith('.kml')]
+        if not kml_files:
+            return 0
+        
+        kml_filename = 'doc.kml' if 'doc.kml' in kml_files else kml_files[0]
+        with kmz.open(kml_filename) as kml_file:
+            for _ in iter_placemarks(kml_file):
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+    
+    return count
+
+
 # Example usage and testing
 if __name__ == "__main__":
-    import sys
-    
     if len(sys.argv) < 2:
         print("Usage: python kmz_parser.py <path_to_kmz_file>")
         print("\nExample:")
@@ -20,27 +20,129 @@ Date: November 2, 2025
 Version: 1.0
 """
 
-from math import radians, sin, cos, sqrt, atan2
+from math import radians, degrees, sin, cos, sqrt, atan2, floor
 import logging
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; batch distances then use NumPy ufuncs
+    njit = None
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Earth's mean radius in meters, as used by haversine_distance
+EARTH_RADIUS_METERS = 6371000
+
+# is_location_match accepts anything within 200m (80% confidence) even when
+# threshold_meters is smaller, so candidate searches never use a smaller radius
+MIN_MATCH_RADIUS_METERS = 200
+
+# Below this many candidates the scalar haversine_distance is cheaper than
+# the fixed overhead of a NumPy call
+BATCH_DISTANCE_MIN_CANDIDATES = 32
+
+# City/state buckets smaller than this are scanned directly; larger ones get
+# their own SpatialGrid
+PLACE_GRID_MIN_SIZE = 16
+
+
+class SpatialGrid:
+    """
+    Uniform latitude/longitude grid for finding points near a coordinate.
+    
+    Points are bucketed into square cells; a query only visits the cells
+    overlapping a bounding box that is guaranteed to contain every point
+    within the search radius, instead of scanning every point.
+    """
+    
+    def __init__(self, radius_meters):
+        """
+        Create an empty grid sized for queries of the given radius.
+        
+        Args:
+            radius_meters (float): Search radius the grid will be queried with
+        """
+        self.radius_meters = radius_meters
+        # Latitude span of the radius, with 5% slack for the bounds below
+        self.lat_span = degrees(radius_meters / EARTH_RADIUS_METERS) * 1.05
+        self.cell_degrees = max(self.lat_span, 1e-6)
+        self.cells = {}
+    
+    def add(self, lat, lon, item):
+        """
+        Add an item at a coordinate.
+        
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+            item: Value returned by query() (e.g. a list index)
+        """
+        key = (floor(lat / self.cell_degrees), floor(lon / self.cell_degrees))
+        self.cells.setdefault(key, []).append(item)
+    
+    def query(self, lat, lon):
+        """
+        Get the items that may lie within the grid's radius of a coordinate.
+        
+        The result is a superset of the true neighbours; callers still check
+        the exact distance. Along a meridian the distance is at least
+        R*|dlat|; across longitudes it is at least R*cos(max_lat)*|dlon|
+        (for spans under ~57 degrees), which sets the box width.
+        
+        Args:
+            lat (float): Latitude in degrees
+            lon (float): Longitude in degrees
+        
+        Returns:
+            list or None: Candidate items, or None when the box reaches a pole
+                or wraps the antimeridian and every item must be considered
+        """
+        max_lat = abs(lat) + self.lat_span
+        if max_lat >= 89.0:
+            return None
+        
+        lon_span = self.lat_span / cos(radians(max_lat))
+        if lon_span >= 50.0 or lon - lon_span < -180.0 or lon + lon_span > 180.0:
+            return None
+        
+        cell = self.cell_degrees
+        candidates = []
+        for i in range(floor((lat - self.lat_span) / cell), floor((lat + self.lat_span) / cell) + 1):
+            for j in range(floor((lon - lon_span) / cell), floor((lon + lon_span) / cell) + 1):
+                items = self.cells.get((i, j))
+                if items:
+                    candidates.extend(items)
+        
+        return candidates
+
 
-def match_locations(csv_locations, kmz_proposed_locations, threshold_meters=200):
+def match_locations(csv_locations, kmz_proposed_locations, threshold_meters=200, greedy=True):
     """
     Find matches between CSV and KMZ proposed locations using geographic proximity.
     
     Each CSV location is matched to at most one KMZ proposed location (1:1 matching).
     Best match is selected based on highest confidence score.
     
+    By default CSV locations are matched greedily in input order, each taking
+    its best KMZ location still available. With greedy=False all candidate
+    pairs are ranked globally (confidence, then distance) and assigned
+    best-first, so an earlier CSV location can't take a KMZ location that a
+    later one matches more closely.
+    
     Args:
         csv_locations (list): List of dicts from Placer.ai CSV with keys:
             - City, State Code, Latitude, Longitude, Property Name, etc.
         kmz_proposed_locations (list): List of dicts from KMZ with keys:
             - city, state, latitude, longitude, name, etc.
         threshold_meters (int): Maximum distance in meters to consider a match (default: 200)
+        greedy (bool): Match in CSV order (default) instead of by global ranking
     
     Returns:
         tuple: (matches, unmatched_csv, unmatched_kmz)
@@ -49,40 +151,168 @@ def match_locations(csv_locations, kmz_proposed_locations, threshold_meters=200)
             - unmatched_kmz (list): KMZ proposed locations with no match found
     """
     matches = []
-    matched_kmz_indices = set()
+    # matched_kmz[i] is 1 once KMZ location i has been matched
+    matched_kmz = bytearray(len(kmz_proposed_locations))
     unmatched_csv = []
     
     logger.info(f"Starting location matching: {len(csv_locations)} CSV locations, "
                 f"{len(kmz_proposed_locations)} KMZ proposed locations")
     
-    # For each CSV location, find the best matching KMZ proposed location
-    for csv_idx, csv_loc in enumerate(csv_locations):
-        best_match = None
-        best_confidence = 0
-        best_kmz_idx = -1
-        best_distance = float('inf')
+    # Bucket KMZ locations with usable coordinates by (city, state), so each
+    # CSV location only sees candidates it could match; anything without
+    # coordinates or a city/state can never match
+    kmz_coords = []
+    kmz_cos_lats = []
+    place_members = {}
+    for kmz_idx, kmz_loc in enumerate(kmz_proposed_locations):
+        coords = _match_coordinates(kmz_loc, 'latitude', 'longitude')
+        kmz_coords.append(coords)
+        # The haversine cos(latitude) term of each KMZ location is computed
+        # once here instead of once per CSV location it's compared with
+        kmz_cos_lats.append(cos(radians(coords[0])) if coords is not None else None)
         
-        # Check against all unmatched KMZ proposed locations
-        for kmz_idx, kmz_loc in enumerate(kmz_proposed_locations):
-            if kmz_idx in matched_kmz_indices:
-                continue  # This KMZ location already matched
-            
-            # Check if these two locations match
-            is_match, confidence, distance = is_location_match(
-                csv_loc, kmz_loc, threshold_meters
+        place = _place_key(kmz_loc.get('city', ''), kmz_loc.get('state', ''))
+        if coords is not None and place is not None:
+            place_members.setdefault(place, []).append(kmz_idx)
+    
+    # Large buckets are further indexed by position so only nearby members
+    # are checked
+    radius = max(threshold_meters, MIN_MATCH_RADIUS_METERS)
+    # Two points further apart in latitude than this are further apart than
+    # radius over any path (the margin covers float rounding)
+    max_delta_lat = degrees(radius / EARTH_RADIUS_METERS) * (1 + 1e-9)
+    place_grids = {}
+    for place, members in place_members.items():
+        if len(members) >= PLACE_GRID_MIN_SIZE:
+            grid = place_grids[place] = SpatialGrid(radius)
+            for kmz_idx in members:
+                grid.add(kmz_coords[kmz_idx][0], kmz_coords[kmz_idx][1], kmz_idx)
+    
+    # Coordinate columns for batch distance calculations (NaN where invalid,
+    # though those are never candidates)
+    if np is not None:
+        kmz_lats = np.array([c[0] if c else np.nan for c in kmz_coords], dtype=np.float64)
+        kmz_lons = np.array([c[1] if c else np.nan for c in kmz_coords], dtype=np.float64)
+        kmz_cos_lat_array = np.cos(np.radians(kmz_lats))
+    
+    csv_coords = [_match_coordinates(loc, 'Latitude', 'Longitude') for loc in csv_locations]
+    csv_places = [_place_key(loc.get('City', ''), loc.get('State Code', '')) for loc in csv_locations]
+    
+    # Buckets too small for a grid are compared in full anyway, so measure
+    # every CSV row in them against every member as one matrix per bucket;
+    # which members are still unmatched is decided below
+    bucket_distances = {}
+    if np is not None:
+        csv_by_place = {}
+        for csv_idx, (coords, place) in enumerate(zip(csv_coords, csv_places)):
+            if coords is not None and place in place_members:
+                csv_by_place.setdefault(place, []).append(csv_idx)
+        
+        for place, rows in csv_by_place.items():
+            members = place_members[place]
+            if place in place_grids or len(rows) * len(members) < BATCH_DISTANCE_MIN_CANDIDATES:
+                continue
+            matrix = haversine_distance_matrix(
+                [csv_coords[i][0] for i in rows], [csv_coords[i][1] for i in rows],
+                kmz_lats[members], kmz_lons[members], cos_lats2=kmz_cos_lat_array[members]
+            )
+            for csv_idx, distance_row in zip(rows, matrix):
+                bucket_distances[csv_idx] = distance_row
+    
+    def candidate_distances(csv_idx):
+        """(kmz_idx, distance) for a CSV location's unmatched candidates, in KMZ index order."""
+        coords = csv_coords[csv_idx]
+        place = csv_places[csv_idx]
+        
+        # Unmatched KMZ proposed locations in the same city/state (and nearby,
+        # for large buckets), in index order so ties resolve as in a full scan
+        distance_row = bucket_distances.get(csv_idx)
+        if distance_row is not None:
+            # Already measured against the whole bucket
+            return zip(place_members[place], distance_row.tolist())
+        
+        if coords is None:
+            candidates = []
+        else:
+            candidates = place_members.get(place, [])
+            grid = place_grids.get(place)
+            if grid is not None:
+                nearby = grid.query(coords[0], coords[1])
+                if nearby is not None:
+                    candidates = sorted(nearby)
+        # Cheap latitude-band reject before any trigonometry
+        candidates = [
+            kmz_idx for kmz_idx in candidates
+            if not matched_kmz[kmz_idx]
+            and abs(kmz_coords[kmz_idx][0] - coords[0]) <= max_delta_lat
+        ]
+        
+        # Distances to all remaining candidates in one call when there are many
+        if np is not None and len(candidates) >= BATCH_DISTANCE_MIN_CANDIDATES:
+            distances = haversine_distance_batch(
+                coords[0], coords[1], kmz_lats[candidates], kmz_lons[candidates],
+                cos_lats2=kmz_cos_lat_array[candidates]
+            ).tolist()
+        elif candidates:
+            # Computed lazily so nothing is wasted after an early exit below
+            lat1, lon1 = coords
+            cos_lat1 = cos(radians(lat1))
+            distances = (
+                _haversine_with_cos(lat1, lon1, cos_lat1, *kmz_coords[kmz_idx],
+                                    kmz_cos_lats[kmz_idx])
+                for kmz_idx in candidates
             )
+        else:
+            distances = ()
+        return zip(candidates, distances)
+    
+    best_matches = {}
+    if greedy:
+        # For each CSV location in turn, take its best unmatched KMZ proposed location
+        for csv_idx in range(len(csv_locations)):
+            best_confidence = 0
+            
+            for kmz_idx, distance in candidate_distances(csv_idx):
+                if matched_kmz[kmz_idx]:
+                    continue  # This KMZ location already matched
+                
+                is_match, confidence = _distance_confidence(distance, threshold_meters)
+                
+                # Keep track of best match
+                if is_match and confidence > best_confidence:
+                    best_matches[csv_idx] = (kmz_idx, confidence, distance)
+                    best_confidence = confidence
+                    
+                    # Nothing scores higher than 1.0 and ties keep the earlier
+                    # candidate, so the rest can't replace this match
+                    if confidence == 1.0:
+                        break
             
-            # Keep track of best match
-            if is_match and confidence > best_confidence:
-                best_match = kmz_loc
-                best_confidence = confidence
-                best_kmz_idx = kmz_idx
-                best_distance = distance
+            if csv_idx in best_matches:
+                matched_kmz[best_matches[csv_idx][0]] = 1
+    else:
+        # Score every candidate pair, then hand out pairs best-first (highest
+        # confidence, then shortest distance) while both sides are unused
+        scored_pairs = []
+        for csv_idx in range(len(csv_locations)):
+            for kmz_idx, distance in candidate_distances(csv_idx):
+                is_match, confidence = _distance_confidence(distance, threshold_meters)
+                if is_match:
+                    scored_pairs.append((-confidence, distance, csv_idx, kmz_idx))
+        scored_pairs.sort()
         
-        # Record the match if found
-        if best_match:
+        for neg_confidence, distance, csv_idx, kmz_idx in scored_pairs:
+            if csv_idx not in best_matches and not matched_kmz[kmz_idx]:
+                best_matches[csv_idx] = (kmz_idx, -neg_confidence, distance)
+                matched_kmz[kmz_idx] = 1
+    
+    # Record the results in CSV order
+    for csv_idx, csv_loc in enumerate(csv_locations):
+        best = best_matches.get(csv_idx)
+        if best is not None:
+            kmz_idx, best_confidence, best_distance = best
+            best_match = kmz_proposed_locations[kmz_idx]
             matches.append((csv_loc, best_match, best_confidence, best_distance))
-            matched_kmz_indices.add(best_kmz_idx)
             logger.debug(f"Match found: CSV '{csv_loc.get('Property Name')}' -> "
                         f"KMZ '{best_match['name']}' "
                         f"({best_distance:.1f}m, {best_confidence*100:.0f}% confidence)")
@@ -93,9 +323,9 @@ def match_locations(csv_locations, kmz_proposed_locations, threshold_meters=200)
     
     # Find unmatched KMZ proposed locations
     unmatched_kmz = [
-        kmz_proposed_locations[i] 
-        for i in range(len(kmz_proposed_locations)) 
-        if i not in matched_kmz_indices
+        kmz_loc
+        for kmz_loc, matched in zip(kmz_proposed_locations, matched_kmz)
+        if not matched
     ]
     
     logger.info(f"Matching complete: {len(matches)} matches, "
@@ -105,6 +335,30 @@ def match_locations(csv_locations, kmz_proposed_locations, threshold_meters=200)
     return matches, unmatched_csv, unmatched_kmz
 
 
+def _match_coordinates(location, lat_key, lon_key):
+    """
+    Get a location's coordinates as is_location_match would read them.
+    
+    Args:
+        location (dict): CSV or KMZ location
+        lat_key (str): Latitude key ('Latitude' or 'latitude')
+        lon_key (str): Longitude key ('Longitude' or 'longitude')
+    
+    Returns:
+        tuple: (lat, lon) floats, or None if missing or invalid
+    """
+    try:
+        lat = float(location[lat_key])
+        lon = float(location[lon_key])
+    except (ValueError, KeyError, TypeError):
+        return None
+    
+    if not is_valid_coordinate(lat, lon):
+        return None
+    
+    return lat, lon
+
+
 def is_location_match(csv_loc, kmz_loc, threshold_meters):
     """
     Determine if a CSV location matches a KMZ proposed location.
@@ -166,18 +420,51 @@ def is_location_match(csv_loc, kmz_loc, threshold_meters):
         return False, 0.0, float('inf')
     
     # 4. Determine match based on distance thresholds
+    is_match, confidence = _distance_confidence(distance, threshold_meters)
+    return is_match, confidence, distance
+
+
+def _place_key(city, state):
+    """
+    Normalize a city/state pair the way is_location_match compares them.
+    
+    Args:
+        city: City value from a CSV or KMZ location
+        state: State code value from a CSV or KMZ location
+    
+    Returns:
+        tuple: (CITY, STATE), or None if either is blank
+    """
+    city = str(city).upper().strip()
+    state = str(state).upper().strip()
+    if not city or not state:
+        return None
+    return city, state
+
+
+def _distance_confidence(distance, threshold_meters):
+    """
+    Score a distance between two same-city locations.
+    
+    Args:
+        distance (float): Distance in meters
+        threshold_meters (float): Maximum distance to consider a match
+    
+    Returns:
+        tuple: (is_match, confidence)
+    """
     if distance <= 50:
         # Within 50 meters - almost certainly the same location
-        return True, 1.0, distance
+        return True, 1.0
     elif distance <= 200:
         # Within 200 meters - very likely the same location
-        return True, 0.8, distance
+        return True, 0.8
     elif distance <= threshold_meters:
         # Within custom threshold - possible match (for manual review)
-        return True, 0.6, distance
+        return True, 0.6
     else:
         # Too far apart
-        return False, 0.0, distance
+        return False, 0.0
 
 
 def haversine_distance(lat1, lon1, lat2, lon2):
@@ -216,6 +503,127 @@ def haversine_distance(lat1, lon1, lat2, lon2):
     return distance
 
 
+def _haversine_with_cos(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    """
+    haversine_distance with cos(radians(lat)) of both points already known.
+    
+    Args:
+        lat1, lon1 (float): First point in degrees
+        cos_lat1 (float): cos(radians(lat1))
+        lat2, lon2 (float): Second point in degrees
+        cos_lat2 (float): cos(radians(lat2))
+    
+    Returns:
+        float: Distance in meters
+    """
+    delta_phi = radians(lat2 - lat1)
+    delta_lambda = radians(lon2 - lon1)
+    
+    a = sin(delta_phi / 2) ** 2 + cos_lat1 * cos_lat2 * sin(delta_lambda / 2) ** 2
+    c = 2 * atan2(sqrt(a), sqrt(1 - a))
+    
+    return EARTH_RADIUS_METERS * c
+
+
+def haversine_distance_batch(lat1, lon1, lats2, lons2, cos_lats2=None):
+    """
+    Calculate Haversine distances from one point to many points at once.
+    
+    Uses NumPy when available; otherwise falls back to haversine_distance
+    for each point.
+    
+    Args:
+        lat1 (float): Latitude of the reference point in degrees
+        lon1 (float): Longitude of the reference point in degrees
+        lats2 (array-like): Latitudes of the other points in degrees
+        lons2 (array-like): Longitudes of the other points in degrees
+        cos_lats2 (array-like): Optional precomputed cos(radians(lats2)), for
+            callers that measure against the same points repeatedly
+    
+    Returns:
+        numpy.ndarray: Distances in meters (a list if NumPy is not installed)
+    """
+    if np is None:
+        return [haversine_distance(lat1, lon1, lat2, lon2)
+                for lat2, lon2 in zip(lats2, lons2)]
+    
+    lats2 = np.asarray(lats2, dtype=np.float64)
+    lons2 = np.asarray(lons2, dtype=np.float64)
+    
+    if cos_lats2 is None:
+        cos_lats2 = np.cos(np.radians(lats2))
+    
+    if _haversine_batch_kernel is not None:
+        return _haversine_batch_kernel(float(lat1), float(lon1), cos(radians(lat1)),
+                                       lats2, lons2, np.asarray(cos_lats2, dtype=np.float64))
+    
+    delta_phi = np.radians(lats2 - lat1)
+    delta_lambda = np.radians(lons2 - lon1)
+    
+    a = np.sin(delta_phi / 2) ** 2 + cos(radians(lat1)) * cos_lats2 * np.sin(delta_lambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return EARTH_RADIUS_METERS * c
+
+
+def haversine_distance_matrix(lats1, lons1, lats2, lons2, cos_lats2=None):
+    """
+    Calculate Haversine distances between every pair of points in two sets.
+    
+    Requires NumPy.
+    
+    Args:
+        lats1, lons1 (array-like): First set of points in degrees (rows)
+        lats2, lons2 (array-like): Second set of points in degrees (columns)
+        cos_lats2 (array-like): Optional precomputed cos(radians(lats2))
+    
+    Returns:
+        numpy.ndarray: len(lats1) x len(lats2) distances in meters
+    """
+    lats1 = np.asarray(lats1, dtype=np.float64)[:, None]
+    lons1 = np.asarray(lons1, dtype=np.float64)[:, None]
+    lats2 = np.asarray(lats2, dtype=np.float64)[None, :]
+    lons2 = np.asarray(lons2, dtype=np.float64)[None, :]
+    cos_lats2 = np.cos(np.radians(lats2)) if cos_lats2 is None else np.asarray(cos_lats2)[None, :]
+    
+    delta_phi = np.radians(lats2 - lats1)
+    delta_lambda = np.radians(lons2 - lons1)
+    
+    a = np.sin(delta_phi / 2) ** 2 + np.cos(np.radians(lats1)) * cos_lats2 * np.sin(delta_lambda / 2) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    
+    return EARTH_RADIUS_METERS * c
+
+
+def _haversine_loop(lat1, lon1, cos_lat1, lats2, lons2, cos_lats2):
+    """
+    Haversine distances from one point to many, as a plain loop for Numba.
+    
+    Each distance is computed exactly as _haversine_with_cos does (no
+    fastmath), so compiled results match the scalar functions.
+    
+    Args:
+        lat1, lon1 (float): Reference point in degrees
+        cos_lat1 (float): cos(radians(lat1))
+        lats2, lons2 (numpy.ndarray): Other points in degrees
+        cos_lats2 (numpy.ndarray): cos(radians(lats2))
+    
+    Returns:
+        numpy.ndarray: Distances in meters
+    """
+    distances = np.empty(lats2.shape[0])
+    for i in range(lats2.shape[0]):
+        delta_phi = radians(lats2[i] - lat1)
+        delta_lambda = radians(lons2[i] - lon1)
+        a = sin(delta_phi / 2) ** 2 + cos_lat1 * cos_lats2[i] * sin(delta_lambda / 2) ** 2
+        distances[i] = EARTH_RADIUS_METERS * (2 * atan2(sqrt(a), sqrt(1 - a)))
+    return distances
+
+
+# Compiled once per machine (cache=True) when Numba is installed
+_haversine_batch_kernel = njit(cache=True)(_haversine_loop) if njit is not None else None
+
+
 def is_valid_coordinate(lat, lon):
     """
     Check if a coordinate pair is valid.
@@ -236,17 +644,9 @@ def is_valid_coordinate(lat, lon):
         lat = float(lat)
         lon = float(lon)
         
-        # Check for (0, 0) - often indicates missing data
-        if lat == 0 and lon == 0:
-            return False
-        
-        # Check range
-        if not (-90 <= lat <= 90):
-            return False
-        if not (-180 <= lon <= 180):
-            return False
-        
-        return True
+        # (0, 0) often indicates missing data; the range checks use abs() so
+        # each axis is one comparison, and NaN fails them
+        return (lat != 0 or lon != 0) and abs(lat) <= 90.0 and abs(lon) <= 180.0
         
     except (ValueError, TypeError):
         return False
@@ -290,20 +690,37 @@ def calculate_match_statistics(matches):
     distances = [m[3] for m in matches]
     confidences = [m[2] for m in matches]
     
+    # Tally confidence tiers and distance ranges in one walk over the matches
+    high_confidence = medium_confidence = low_confidence = 0
+    for c in confidences:
+        if c >= 0.9:
+            high_confidence += 1
+        elif c >= 0.7:
+            medium_confidence += 1
+        elif c < 0.7:
+            low_confidence += 1
+    
+    distance_ranges = dict.fromkeys(('0-50m', '50-100m', '100-200m', '200-500m', '500m+'), 0)
+    for d in distances:
+        if d <= 50:
+            distance_ranges['0-50m'] += 1
+        elif d <= 100:
+            distance_ranges['50-100m'] += 1
+        elif d <= 200:
+            distance_ranges['100-200m'] += 1
+        elif d <= 500:
+            distance_ranges['200-500m'] += 1
+        elif d > 500:
+            distance_ranges['500m+'] += 1
+    
     stats = {
         'total_matches': total,
         'avg_distance': sum(distances) / total,
         'avg_confidence': sum(confidences) / total,
-        'high_confidence': sum(1 for c in confidences if c >= 0.9),
-        'medium_confidence': sum(1 for c in confidences if 0.7 <= c < 0.9),
-        'low_confidence': sum(1 for c in confidences if c < 0.7),
-        'distance_ranges': {
-            '0-50m': sum(1 for d in distances if d <= 50),
-            '50-100m': sum(1 for d in distances if 50 < d <= 100),
-            '100-200m': sum(1 for d in distances if 100 < d <= 200),
-            '200-500m': sum(1 for d in distances if 200 < d <= 500),
-            '500m+': sum(1 for d in distances if d > 500)
-        }
+        'high_confidence': high_confidence,
+        'medium_confidence': medium_confidence,
+        'low_confidence': low_confidence,
+        'distance_ranges': distance_ranges
     }
     
     return stats
@@ -0,0 +1,188 @@
+"""
+Tests for csv_parser: the pandas (columnar) parser must produce exactly
+what the csv module row parser does.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import csv_parser
+
+HEADER = 'Rank,Property Name,Latitude,Longitude,City,State,State Code,Zip Code,Note\n'
+
+# Leading-zero ZIPs, signed text and a Rank column with a blank cell are all
+# values a type-inferring reader would rewrite
+ROWS = (
+    '1,Store A,42.3496,-71.1087,Boston,Massachusetts,ma,02134,+7\n'
+    ',Store B,40.8154,-73.0451,Holtsville,New York,NY,00501,-0\n'
+    '3,Store C,42.3523,-71.1234,Boston,Massachusetts,MA,02135,1e3\n'
+)
+
+
+@unittest.skipIf(csv_parser.pd is None, "pandas is not installed")
+class ColumnarParserTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'locations.csv')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(HEADER + ROWS)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_vectorized_matches_row_parser(self):
+        self.assertEqual(csv_parser.parse_csv_vectorized(self.csv_path),
+                         csv_parser.parse_csv_rows(self.csv_path))
+    
+    def test_text_fields_keep_their_literal_value(self):
+        locations = csv_parser.parse_csv_vectorized(self.csv_path)
+        
+        self.assertEqual([loc['Zip Code'] for loc in locations], ['02134', '00501', '02135'])
+        self.assertEqual([loc['Note'] for loc in locations], ['+7', '-0', '1e3'])
+        self.assertEqual([loc['Rank'] for loc in locations], [1, None, 3])
+    
+    def _write(self, text):
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+    
+    def test_trailing_comma_rows_parse(self):
+        # Every row has one field more than the header
+        self._write(HEADER + ROWS.replace('\n', ',\n'))
+        
+        with self.assertWarns(csv_parser.pd.errors.ParserWarning):
+            locations = csv_parser.parse_csv_vectorized(self.csv_path)
+        
+        # The columnar path drops the extra field; the row parser keeps it under None
+        expected = csv_parser.parse_csv_rows(self.csv_path)
+        for row in expected:
+            self.assertEqual(row.pop(None), [''])
+        self.assertEqual(locations, expected)
+        self.assertEqual(csv_parser.parse_csv(self.csv_path), locations)
+    
+    def test_repeated_header_keeps_last_value(self):
+        self._write('Rank,Property Name,City,Latitude,Longitude,City,State,State Code,Zip Code\n'
+                    '1,Store A,Boston,42.3496,-71.1087,Cambridge,Massachusetts,MA,02138\n')
+        
+        locations = csv_parser.parse_csv_vectorized(self.csv_path)
+        
+        self.assertEqual(locations, csv_parser.parse_csv_rows(self.csv_path))
+        self.assertEqual(locations[0]['City'], 'Cambridge')
+        self.assertEqual(list(locations[0])[:3], ['Rank', 'Property Name', 'City'])
+    
+    def test_row_numbers_count_blank_lines_like_csv_reader(self):
+        # csv.reader skips the empty line but counts the whitespace-only one
+        # and the row of empty fields
+        rows = ROWS.splitlines(keepends=True)
+        self._write(HEADER + rows[0] + '\n' + '   \n' + ',,,,,,,,\n' + rows[1] + rows[2])
+        
+        locations = csv_parser.parse_csv_vectorized(self.csv_path)
+        
+        self.assertEqual(locations, csv_parser.parse_csv_rows(self.csv_path))
+        self.assertEqual([loc['_row_number'] for loc in locations], [2, 5, 6])
+    
+    def test_quoted_line_breaks_match_row_parser(self):
+        # CRLF line endings, with one inside a quoted value
+        rows = ROWS.replace('Holtsville', '"Holts\nville"')
+        self._write((HEADER + rows).replace('\n', '\r\n'))
+        
+        locations = csv_parser.parse_csv_vectorized(self.csv_path)
+        
+        self.assertEqual(locations, csv_parser.parse_csv_rows(self.csv_path))
+        self.assertEqual(locations[1]['City'], 'Holts\nville')
+
+
+
+# Signed and zero-padded values in numeric and text columns alike
+SIGNED_HEADER = ('Rank,Property Name,Latitude,Longitude,City,State,State Code,'
+                 'Zip Code,Store Id,Visits\n')
+SIGNED_ROWS = (
+    '+1,Store A,+42.3496,-71.1087,Boston,Massachusetts,MA,02134,007,+1200\n'
+    '-2,Store B,40.8154,-073.0451,Holtsville,New York,ny,00501,-0,-0\n'
+    ' 3 ,Store C,42.3523,-71.1234,Boston,Massachusetts,MA,02135,+7,\n'
+)
+
+
+@unittest.skipIf(csv_parser.pd is None, "pandas is not installed")
+class ColumnarReaderTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'locations.csv')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(SIGNED_HEADER + SIGNED_ROWS)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_columns_match_iter_csv_rows(self):
+        columns = csv_parser.parse_csv_columns(self.csv_path)
+        
+        self.assertEqual(columns.to_dict('records'),
+                         list(csv_parser.iter_csv_rows(self.csv_path)))
+        self.assertEqual(list(columns['Store Id']), ['007', '-0', '+7'])
+        self.assertEqual(list(columns['Rank']), [1, -2, 3])
+    
+    @unittest.skipIf(csv_parser.pa_csv is None, "pyarrow is not installed")
+    def test_arrow_reader_matches_c_reader(self):
+        with mock.patch.object(csv_parser, 'pa_csv', None):
+            expected = csv_parser.parse_csv_columns(self.csv_path).to_dict('records')
+        
+        self.assertEqual(csv_parser.parse_csv_columns(self.csv_path).to_dict('records'), expected)
+    
+    def test_preview_matches_row_based_preview(self):
+        preview = csv_parser.get_csv_preview(self.csv_path)
+        with mock.patch.object(csv_parser, 'pd', None):
+            row_preview = csv_parser.get_csv_preview(self.csv_path)
+        
+        self.assertEqual(preview, row_preview)
+        self.assertEqual([loc['Zip Code'] for loc in preview['preview_locations']],
+                         ['02134', '00501', '02135'])
+
+
+
+class ParseCacheTest(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.csv_path = os.path.join(self.temp_dir, 'locations.csv')
+        self.cache_dir = os.path.join(self.temp_dir, '.parse_cache')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(HEADER + ROWS)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_cached_parse_round_trips_as_json(self):
+        expected = csv_parser.parse_csv(self.csv_path)
+        
+        self.assertEqual(csv_parser.parse_csv_cached(self.csv_path, self.cache_dir), expected)
+        cache_files = os.listdir(self.cache_dir)
+        self.assertEqual(len(cache_files), 1)
+        with open(os.path.join(self.cache_dir, cache_files[0]), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), expected)
+        
+        # Second call is served from the cache file
+        self.assertEqual(csv_parser.parse_csv_cached(self.csv_path, self.cache_dir), expected)
+
+    
+    def test_rows_with_extra_fields_are_not_cached(self):
+        # One row longer than the rest sends parse_csv to the row parser,
+        # which keeps the extra field under None
+        rows = ROWS.splitlines(keepends=True)
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(HEADER + rows[0] + rows[1].replace('\n', ',extra\n') + rows[2])
+        expected = csv_parser.parse_csv(self.csv_path)
+        self.assertEqual(expected[1][None], ['extra'])
+        
+        self.assertEqual(csv_parser.parse_csv_cached(self.csv_path, self.cache_dir), expected)
+        self.assertEqual(csv_parser.parse_csv_cached(self.csv_path, self.cache_dir), expected)
+        self.assertFalse(os.path.isdir(self.cache_dir) and os.listdir(self.cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
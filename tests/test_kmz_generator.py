@@ -0,0 +1,54 @@
+"""
+Tests for kmz_generator: the KML is written as text, so the document bytes
+are checked directly rather than re-serialized through ElementTree.
+"""
+
+import io
+import unittest
+import zipfile
+
+import kmz_generator
+
+LOCATION = {
+    'Property Name': 'Example Store & Co',
+    'City': 'Exampleville',
+    'State': 'Ohio',
+    'State Code': 'OH',
+    'Rank': 1,
+    'Latitude': 40.0,
+    'Longitude': -83.0,
+}
+
+
+class KmlDocumentTest(unittest.TestCase):
+    
+    def _document(self, locations):
+        output = io.BytesIO()
+        kmz_generator.generate_kmz(locations, output)
+        with zipfile.ZipFile(output) as kmz:
+            return kmz.read('doc.kml')
+    
+    def test_document_populates_extended_data(self):
+        document = self._document([LOCATION])
+        
+        self.assertTrue(document.startswith(b'<?xml version="1.0" encoding="UTF-8"?>'))
+        self.assertIn(b'<SimpleData name="Name">Example Store &amp; Co</SimpleData>', document)
+        self.assertIn(b'<SimpleData name="City">Exampleville</SimpleData>', document)
+        self.assertIn(b'<coordinates>-83.0,40.0,0</coordinates>', document)
+        self.assertTrue(document.endswith(kmz_generator.KML_EPILOG.encode()))
+    
+    def test_kmz_matches_generate_kml(self):
+        metadata = {'date_range': 'Apr 1 - Jun 2023'}
+        
+        output = io.BytesIO()
+        kmz_generator.generate_kmz([LOCATION], output, metadata=dict(metadata))
+        with zipfile.ZipFile(output) as kmz:
+            document = kmz.read('doc.kml')
+        
+        expected_metadata = dict(metadata, state_store_counts={'OH': 1})
+        self.assertEqual(document,
+                         kmz_generator.generate_kml([LOCATION], expected_metadata).encode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()